@@ -1,104 +1,182 @@
 from typing import Any, Dict, List
 import pandas as pd
+import os
 import re
 import json
+import unicodedata
+import warnings
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
-def Crear_Variables_De_Orden_IP_Items(df):
+# Decodificador JSON: usa orjson o simdjson si están instalados y, si no,
+# la librería estándar. Todos lanzan ValueError ante un JSON inválido.
+try:
+    import orjson
+    Decodificar_JSON = orjson.loads
+except ImportError:
+    try:
+        import simdjson
+        Decodificar_JSON = simdjson.loads
+    except ImportError:
+        Decodificar_JSON = json.loads
+
+def Extraer_Orden_IP_Items(Datos_Sujeto):
 
     """
-    Procesa todo el DataFrame para extraer orden de IP Items y último Item.
+    Extrae el orden de aparición de los IP Items de un sujeto ya decodificado.
+
+    """
+
+    return [
+        int(Clave.split('_')[-1]) for Clave in
+        Datos_Sujeto['results'][1]['fase_3']['IP'].keys()
+        if Clave.startswith('IP_item_')
+    ]
+
+def Extraer_Orden_IP_Items_Asociados(Datos_Sujeto):
+
+    """
+    Extrae el orden de aparición de los IP Items asociados a candidatos
+    (con sufijo _Izq/_Der) de un sujeto ya decodificado.
+
+    """
+
+    Orden_IP_Items = []
+    for Clave in Datos_Sujeto['results'][1]['fase_3']['IP_modificada'].keys():
+        if Clave.startswith('IP_item_'):
+            Partes = Clave.split('_')
+            if len(Partes) > 3:
+                Orden_IP_Items.append(Partes[2] + '_' + Partes[3])
+
+    return Orden_IP_Items
+
+def Decodificar_Columna_Results(df):
+
+    """
+    Decodifica una única vez el JSON de cada fila de la columna 'results'
+    y extrae, en esa misma pasada, todo lo que necesitan las funciones
+    de extracción: el orden de IP Items, el orden de IP Items asociados
+    y los datos del sujeto que luego se aplanan en columnas.
 
     Parámetros:
-    - df: DataFrame con la columna 'results' conteniendo JSON.
+    - df: DataFrame con la columna 'results' conteniendo JSON (o los
+      sujetos ya decodificados por Leer_CSV_Crudo con Campos_Results).
 
     Retorna:
-    - DataFrame modificado con las nuevas columnas agregadas.
+    - Diccionario de listas alineadas con las filas de df, con las claves
+      'Orden_IP_Items', 'Ultimo_IP_Item', 'Orden_IP_Items_Asociados',
+      'Ultimo_IP_Item_Asociado' y 'Datos_Sujetos' (None en las filas
+      sin JSON válido). Puede pasarse como 'Resultados_Decodificados' a
+      Crear_Variables_De_Orden_IP_Items,
+      Crear_Variables_De_Orden_IP_Items_Asociados y
+      Procesar_Columna_Results para no volver a decodificar.
 
     """
 
-    def Extraer_Datos_JSON(Fila_JSON):
+    Resultados_Decodificados = {
+        'Orden_IP_Items': [],
+        'Ultimo_IP_Item': [],
+        'Orden_IP_Items_Asociados': [],
+        'Ultimo_IP_Item_Asociado': [],
+        'Datos_Sujetos': []
+    }
+
+    for Contenido_JSON in df['results']:
+
+        # Decodificar el JSON una sola vez por sujeto.
+        Datos_Sujeto = None
+        if isinstance(Contenido_JSON, dict):
+            Datos_Sujeto = Contenido_JSON
+        elif isinstance(Contenido_JSON, (str, bytes)):
+            try:
+                Datos_Sujeto = Decodificar_JSON(Contenido_JSON)
+            except (ValueError, TypeError):
+                Datos_Sujeto = None
+
+        # Orden de IP Items.
+        try:
+            Orden_IP_Items = Extraer_Orden_IP_Items(Datos_Sujeto)
+        except (KeyError, IndexError, TypeError, AttributeError):
+            Orden_IP_Items = []
+
+        # Orden de IP Items asociados a candidatos.
         try:
-            # Convertir el string JSON a diccionario de Python.
-            Datos_Sujeto = json.loads(Fila_JSON)
+            Orden_IP_Items_Asociados = Extraer_Orden_IP_Items_Asociados(
+                Datos_Sujeto
+            )
+        except (KeyError, IndexError, TypeError, AttributeError):
+            Orden_IP_Items_Asociados = []
 
-            # Extraer el orden de aparición de los IP Items.
-            Orden_IP_Items = [
-                    int(Clave.split('_')[-1]) for Clave in 
-                    Datos_Sujeto['results'][1]['fase_3']['IP'].keys() 
-                    if Clave.startswith('IP_item_')
-                                ]
+        Resultados_Decodificados['Orden_IP_Items'].append(Orden_IP_Items)
+        Resultados_Decodificados['Ultimo_IP_Item'].append(
+            Orden_IP_Items[-1] if Orden_IP_Items else None
+        )
+        Resultados_Decodificados['Orden_IP_Items_Asociados'].append(
+            Orden_IP_Items_Asociados
+        )
+        Resultados_Decodificados['Ultimo_IP_Item_Asociado'].append(
+            Orden_IP_Items_Asociados[-1] if Orden_IP_Items_Asociados
+            else None
+        )
+        Resultados_Decodificados['Datos_Sujetos'].append(
+            Datos_Sujeto if isinstance(Datos_Sujeto, dict) else None
+        )
 
-            # Obtener el último IP Item de la lista.
-            Ultimo_IP_Item = Orden_IP_Items[-1] if Orden_IP_Items else None
+    return Resultados_Decodificados
 
-            return Orden_IP_Items, Ultimo_IP_Item
+def Crear_Variables_De_Orden_IP_Items(df, Resultados_Decodificados = None):
 
-        except (KeyError, IndexError, json.JSONDecodeError):
-            # En caso de error, retornar valores vacíos.
-            return [], None
+    """
+    Procesa todo el DataFrame para extraer orden de IP Items y último Item.
 
-    # Aplicar la función a todas las filas del DataFrame.
-    Resultados_Procesados = df['results'].apply(
-        Extraer_Datos_JSON
-    )
+    Parámetros:
+    - df: DataFrame con la columna 'results' conteniendo JSON.
+    - Resultados_Decodificados: salida de Decodificar_Columna_Results
+      sobre df. Si no se indica, se decodifica la columna 'results'.
+
+    Retorna:
+    - DataFrame modificado con las nuevas columnas agregadas.
+
+    """
+
+    if Resultados_Decodificados is None:
+        Resultados_Decodificados = Decodificar_Columna_Results(df)
 
     # Agregar las nuevas columnas al DataFrame.
-    df['Orden_IP_Items'] = [
-        Resultado[0] for Resultado in Resultados_Procesados
-    ]
-    df['Ultimo_IP_Item'] = [
-        Resultado[1] for Resultado in Resultados_Procesados
-    ]
+    df['Orden_IP_Items'] = Resultados_Decodificados['Orden_IP_Items']
+    df['Ultimo_IP_Item'] = Resultados_Decodificados['Ultimo_IP_Item']
 
     return df
 
-def Crear_Variables_De_Orden_IP_Items_Asociados(df):
+def Crear_Variables_De_Orden_IP_Items_Asociados(
+    df,
+    Resultados_Decodificados = None
+):
     
     """
     Procesa todo el DataFrame para extraer orden de IP Items asociados a candidatos y último Item.
     
     Parámetros:
     - df: DataFrame con la columna 'results' conteniendo JSON.
+    - Resultados_Decodificados: salida de Decodificar_Columna_Results
+      sobre df. Si no se indica, se decodifica la columna 'results'.
     
     Retorna:
     - DataFrame modificado con las nuevas columnas agregadas.
     
     """
     
-    import json
-    
-    Lista_Orden_IP_Items = []
-    Lista_Ultimo_IP_Item = []
-    
-    for Fila_JSON in df['results']:
-        try:
-            # Convertir el string JSON a diccionario de Python.
-            Datos_Sujeto = json.loads(Fila_JSON)
-            
-            # Extraer números de IP Items con sufijo _Izq/_Der de la sección "IP_modificada".
-            Orden_IP_Items = [
-                Clave.split('_')[2] + '_' + Clave.split('_')[3] for Clave in 
-                Datos_Sujeto['results'][1]['fase_3']['IP_modificada'].keys() 
-                if Clave.startswith('IP_item_') and len(Clave.split('_')) > 3
-            ]
-            
-            # Obtener el último IP Item de la lista.
-            Ultimo_IP_Item = Orden_IP_Items[-1] if Orden_IP_Items else None
-            
-            Lista_Orden_IP_Items.append(Orden_IP_Items)
-            Lista_Ultimo_IP_Item.append(Ultimo_IP_Item)
-            
-        except (KeyError, IndexError, json.JSONDecodeError):
-            # En caso de error, agregar valores vacíos.
-            Lista_Orden_IP_Items.append([])
-            Lista_Ultimo_IP_Item.append(None)
+    if Resultados_Decodificados is None:
+        Resultados_Decodificados = Decodificar_Columna_Results(df)
     
     # Agregar las nuevas columnas al DataFrame.
-    df['Orden_IP_Items_Asociados'] = Lista_Orden_IP_Items
-    df['Ultimo_IP_Item_Asociado'] = Lista_Ultimo_IP_Item
+    df['Orden_IP_Items_Asociados'] = (
+        Resultados_Decodificados['Orden_IP_Items_Asociados']
+    )
+    df['Ultimo_IP_Item_Asociado'] = (
+        Resultados_Decodificados['Ultimo_IP_Item_Asociado']
+    )
     
     return df
 
@@ -123,24 +201,25 @@ def Crear_Primeros_IP_Items_Asociados(df, n):
     
     return df
 
-def Aplanar_Diccionario(Diccionario, Prefijo = ''):
+def Aplanar_Diccionario(Diccionario, Prefijo = '', Diccionario_Plano = None):
     
     """
     Convierte un diccionario anidado en uno plano,
     usando puntos para separar los niveles de anidamiento.
+    Si se indica 'Diccionario_Plano', escribe las claves directamente
+    sobre él en lugar de crear un diccionario nuevo.
     
     """
     
-    Diccionario_Plano = {}
+    if Diccionario_Plano is None:
+        Diccionario_Plano = {}
     
     for Clave, Valor in Diccionario.items():
         Nueva_Clave = f"{Prefijo}.{Clave}" if Prefijo else Clave
         
         if isinstance(Valor, dict):
             # Recursión para diccionarios anidados.
-            Diccionario_Plano.update(
-                Aplanar_Diccionario(Valor, Nueva_Clave)
-            )
+            Aplanar_Diccionario(Valor, Nueva_Clave, Diccionario_Plano)
         elif isinstance(Valor, list):
             # Convertir listas a strings separados por comas.
             Diccionario_Plano[Nueva_Clave] = ', '.join(map(str, Valor))
@@ -149,63 +228,122 @@ def Aplanar_Diccionario(Diccionario, Prefijo = ''):
     
     return Diccionario_Plano
 
-def Procesar_Columna_Results(df):
+def Construir_DataFrame_Columnar(
+    Datos_Sujetos,
+    Mapeo_Nombres_Columnas = None,
+    Solo_Columnas_Mapeadas = False
+):
     
     """
-    Extrae y procesa la columna 'results' de un DataFrame,
-    convirtiendo el contenido JSON en un DataFrame de pandas.
-    Maneja valores NaN y datos faltantes.
+    Aplana los sujetos decodificados escribiendo cada valor directamente
+    en la columna que le corresponde, sin armar un diccionario por fila.
+    Cada columna se reserva completa (con NaN) la primera vez que aparece
+    su clave, y el tipo de dato se infiere una sola vez por columna.
+    
+    Parámetros:
+    - Datos_Sujetos: lista de diccionarios decodificados (los None se
+      descartan).
+    - Mapeo_Nombres_Columnas: diccionario {clave con puntos: nombre final}
+      que se aplica al construir las columnas.
+    - Solo_Columnas_Mapeadas: si es True, solo se construyen las columnas
+      presentes en el mapeo.
+    
+    Retorna:
+    - DataFrame con una fila por sujeto válido.
     
     """
     
-    # Extraer solo la columna 'results'.
-    Columna_Results = df['results']
+    Datos_Validos = [
+        Datos_Sujeto for Datos_Sujeto in Datos_Sujetos
+        if Datos_Sujeto is not None
+    ]
+    Numero_Filas = len(Datos_Validos)
+    
+    if Mapeo_Nombres_Columnas is None:
+        Mapeo_Nombres_Columnas = {}
     
-    # Lista para almacenar los datos procesados.
-    Lista_Datos_Procesados = []
+    # Columnas finales en orden de aparición y, para cada clave con
+    # puntos, la lista donde se escriben sus valores (False si la clave
+    # se descarta). El renombre se resuelve una sola vez por clave.
+    Columnas: Dict[str, list] = {}
+    Destinos: Dict[str, Any] = {}
     
-    # Procesar cada fila de la columna results.
-    for Indice, Contenido_JSON in enumerate(Columna_Results):
-        try:
-            # Verificar si el contenido no es NaN o nulo.
-            if pd.isna(Contenido_JSON) or Contenido_JSON is None:
-                continue
+    def Crear_Destino(Clave):
+        if Clave in Mapeo_Nombres_Columnas:
+            Nombre = Mapeo_Nombres_Columnas[Clave]
+        elif Solo_Columnas_Mapeadas:
+            Destinos[Clave] = False
+            return False
+        else:
+            Nombre = Clave
+        if Nombre not in Columnas:
+            Columnas[Nombre] = [np.nan] * Numero_Filas
+        Destinos[Clave] = Columnas[Nombre]
+        return Destinos[Clave]
+    
+    def Escribir_Diccionario(Diccionario, Prefijo, Fila):
+        for Clave, Valor in Diccionario.items():
+            Nueva_Clave = Prefijo + Clave
+            Tipo_Valor = type(Valor)
             
-            # Verificar que sea string.
-            if not isinstance(Contenido_JSON, str):
+            if Tipo_Valor is dict:
+                # Recursión para diccionarios anidados.
+                Escribir_Diccionario(Valor, Nueva_Clave + '.', Fila)
                 continue
             
-            # Convertir el string JSON a diccionario Python.
-            Datos_JSON = json.loads(Contenido_JSON)
-            
-            # Extraer el array 'results' del JSON.
-            Array_Results = Datos_JSON.get('results', [])
-            
-            # Agregar identificadores para mantener la trazabilidad.
-            Fila_Procesada = {
-                'id': Datos_JSON.get('subject')
-            }
+            Columna = Destinos.get(Nueva_Clave)
+            if Columna is None:
+                Columna = Crear_Destino(Nueva_Clave)
+            if Columna is False:
+                continue
             
-            # Procesar cada elemento del array results.
+            if Tipo_Valor is list:
+                # Convertir listas a strings separados por comas.
+                Valor = ', '.join(map(str, Valor))
+            Columna[Fila] = Valor
+    
+    for Fila, Datos_Sujeto in enumerate(Datos_Validos):
+        
+        # Identificador para mantener la trazabilidad.
+        Escribir_Diccionario({'id': Datos_Sujeto.get('subject')}, '', Fila)
+        
+        Array_Results = Datos_Sujeto.get('results', [])
+        if isinstance(Array_Results, list):
             for Item in Array_Results:
                 if isinstance(Item, dict):
-                    # Aplanar el diccionario anidado.
-                    Datos_Aplanados = Aplanar_Diccionario(Item)
-                    Fila_Procesada.update(Datos_Aplanados)
-            
-            Lista_Datos_Procesados.append(Fila_Procesada)
-            
-        except json.JSONDecodeError as Error:
-            continue
-        except Exception as Error:
-            continue
+                    Escribir_Diccionario(Item, '', Fila)
     
-    # Verificar si se procesaron datos.
-    if not Lista_Datos_Procesados:
+    if not Columnas:
         return pd.DataFrame()
     
-    # Crear DataFrame con los datos procesados.
-    DataFrame_Final = pd.DataFrame(Lista_Datos_Procesados)
+    return pd.DataFrame(Columnas)
+
+def Procesar_Columna_Results(
+    df,
+    Resultados_Decodificados = None,
+    Mapeo_Nombres_Columnas = None,
+    Solo_Columnas_Mapeadas = False
+):
+    
+    """
+    Extrae y procesa la columna 'results' de un DataFrame,
+    convirtiendo el contenido JSON en un DataFrame de pandas.
+    Maneja valores NaN y datos faltantes. Si se indica
+    'Resultados_Decodificados' (salida de Decodificar_Columna_Results),
+    reutiliza esos datos en lugar de volver a decodificar.
+    Si se indica 'Mapeo_Nombres_Columnas', las columnas se renombran al
+    construirlas (ver Construir_DataFrame_Columnar).
+    
+    """
+    
+    if Resultados_Decodificados is None:
+        Resultados_Decodificados = Decodificar_Columna_Results(df)
+    
+    DataFrame_Final = Construir_DataFrame_Columnar(
+        Resultados_Decodificados['Datos_Sujetos'],
+        Mapeo_Nombres_Columnas,
+        Solo_Columnas_Mapeadas
+    )
     
     return DataFrame_Final
 
@@ -214,6 +352,12 @@ def Rellenar_IP_Items_Asociados_Faltantes(df):
    """
    Rellena los valores faltantes en columnas IP_Item_X_Izq/Der cuando 
    uno tiene valor y el otro es NaN, usando la mediana por categoria.
+   Las medianas de todas las columnas de Respuesta y Tiempo se calculan
+   en una única pasada agrupada y los rellenos se aplican de una vez.
+   
+   Retorna:
+   - DataFrame con la cantidad de rellenos por columna y categoría
+     (columnas 'Columna', 'Categoria_PASO_2023' y 'Rellenos').
    
    """
    
@@ -227,598 +371,4053 @@ def Rellenar_IP_Items_Asociados_Faltantes(df):
                Numero = Partes[2]
                Numeros_IP.add(Numero)
    
-   #print(f"  IP_Items encontrados: {sorted(Numeros_IP)}")
-   
-   Total_Rellenos = 0
-   
-   # Para cada numero de IP_Item, procesar Respuesta y Tiempo.
+   # Pares de columnas Izq/Der que existen en el DataFrame.
+   Columnas_Izq = []
+   Columnas_Der = []
    for Numero in sorted(Numeros_IP):
        for Tipo in ['Respuesta', 'Tiempo']:
            Col_Izq = f'IP_Item_{Numero}_Izq_{Tipo}'
            Col_Der = f'IP_Item_{Numero}_Der_{Tipo}'
-           
-           # Verificar que ambas columnas existen.
            if Col_Izq in df.columns and Col_Der in df.columns:
-               
-               # Contar datos iniciales.
-               Datos_Iniciales_Izq = df[Col_Izq].notna().sum()
-               Datos_Iniciales_Der = df[Col_Der].notna().sum()
-               
-               # Convertir a numerico si es necesario.
-               df[Col_Izq] = pd.to_numeric(df[Col_Izq], errors='coerce')
-               df[Col_Der] = pd.to_numeric(df[Col_Der], errors='coerce')
-               
-               # Encontrar filas donde uno tiene valor y otro es NaN.
-               Mask_Izq_Lleno_Der_Vacio = (
-                   df[Col_Izq].notna() & df[Col_Der].isna()
-               )
-               Mask_Der_Lleno_Izq_Vacio = (
-                   df[Col_Der].notna() & df[Col_Izq].isna()
-               )
-               
-               Casos_Izq_Der = Mask_Izq_Lleno_Der_Vacio.sum()
-               Casos_Der_Izq = Mask_Der_Lleno_Izq_Vacio.sum()
-               
-               #if Casos_Izq_Der > 0 or Casos_Der_Izq > 0:
-                #    print(f"    {Col_Izq}/{Col_Der}:")
-                #    print(f"      - Datos iniciales: Izq={Datos_Iniciales_Izq}, "
-                #          f"Der={Datos_Iniciales_Der}")
-                #    print(f"      - Casos Izq→Der: {Casos_Izq_Der}")
-                #    print(f"      - Casos Der→Izq: {Casos_Der_Izq}")
-               
-               # Calcular medianas por categoria para cada columna.
-               Medianas_Izq = df.groupby('Categoria_PASO_2023')[Col_Izq].median()
-               Medianas_Der = df.groupby('Categoria_PASO_2023')[Col_Der].median()
-               
-               # Mostrar las medianas calculadas si hay casos para rellenar.
-            #    if Casos_Izq_Der > 0:
-            #        print(f"      - Medianas para {Col_Der}: "
-            #              f"{Medianas_Der.to_dict()}")
-               
-            #    if Casos_Der_Izq > 0:
-            #        print(f"      - Medianas para {Col_Izq}: "
-            #              f"{Medianas_Izq.to_dict()}")
-               
-               # Rellenar valores faltantes en Der cuando Izq tiene valor.
-               Rellenos_Der = 0
-               for Indice in df[Mask_Izq_Lleno_Der_Vacio].index:
-                   Categoria = df.loc[Indice, 'Categoria_PASO_2023']
-                   Valor_Izq = df.loc[Indice, Col_Izq]
-                   Id_Participante = df.loc[Indice, 'ID']
-                   
-                   if (Categoria in Medianas_Der.index and 
-                       pd.notna(Medianas_Der[Categoria])):
-                       Valor_Mediana = Medianas_Der[Categoria]
-                       df.loc[Indice, Col_Der] = Valor_Mediana
-                       Rellenos_Der += 1
-                    #    if Rellenos_Der <= 3:  # Mostrar primeros 3 casos.
-                    #        print(f"        ID={Id_Participante}, "
-                    #              f"Categoría={Categoria}, "
-                    #              f"Izq={Valor_Izq} → Der={Valor_Mediana}")
-               
-               # Rellenar valores faltantes en Izq cuando Der tiene valor.
-               Rellenos_Izq = 0
-               for Indice in df[Mask_Der_Lleno_Izq_Vacio].index:
-                   Categoria = df.loc[Indice, 'Categoria_PASO_2023']
-                   Valor_Der = df.loc[Indice, Col_Der]
-                   Id_Participante = df.loc[Indice, 'ID']
-                   
-                   if (Categoria in Medianas_Izq.index and 
-                       pd.notna(Medianas_Izq[Categoria])):
-                       Valor_Mediana = Medianas_Izq[Categoria]
-                       df.loc[Indice, Col_Izq] = Valor_Mediana
-                       Rellenos_Izq += 1
-                      # if Rellenos_Izq <= 3:  # Mostrar primeros 3 casos.
-                        #    print(f"        ID={Id_Participante}, "
-                        #          f"Categoría={Categoria}, "
-                        #          f"Der={Valor_Der} → Izq={Valor_Mediana}")
-               
-               # Contar datos finales.
-               Datos_Finales_Izq = df[Col_Izq].notna().sum()
-               Datos_Finales_Der = df[Col_Der].notna().sum()
-               
-               Total_Rellenos += Rellenos_Der + Rellenos_Izq               
-              # if Casos_Izq_Der > 0 or Casos_Der_Izq > 0:
-    #                    print(f"      - Rellenos realizados: Der={Rellenos_Der}, "
-    #                          f"Izq={Rellenos_Izq}")
-    #                    print(f"      - Datos finales: Izq={Datos_Finales_Izq}, "
-    #                          f"Der={Datos_Finales_Der}")
-    #                    print()
-    
-    #    print(f"  Total de rellenos realizados: {Total_Rellenos}")
-
-def Eliminar_Primeros_Datos_IP_Items_Asociados(df):
+               Columnas_Izq.append(Col_Izq)
+               Columnas_Der.append(Col_Der)
+   
+   Columnas_Reporte = ['Columna', 'Categoria_PASO_2023', 'Rellenos']
+   if not Columnas_Izq:
+       return pd.DataFrame(columns=Columnas_Reporte)
+   
+   Columnas = Columnas_Izq + Columnas_Der
+   
+   # Convertir a numerico todas las columnas de una vez.
+   df[Columnas] = df[Columnas].apply(pd.to_numeric, errors='coerce')
+   Valores = df[Columnas].to_numpy(dtype=float)
+   
+   # Medianas por categoria de todas las columnas en una sola pasada,
+   # ya alineadas con cada fila (NaN si la categoria no tiene datos).
+   Medianas = df[Columnas].groupby(
+       df['Categoria_PASO_2023']
+   ).transform('median').to_numpy(dtype=float)
+   
+   Numero_Pares = len(Columnas_Izq)
+   Izq, Der = Valores[:, :Numero_Pares], Valores[:, Numero_Pares:]
+   Medianas_Izq = Medianas[:, :Numero_Pares]
+   Medianas_Der = Medianas[:, Numero_Pares:]
+   
+   # Rellenar Der cuando Izq tiene valor y viceversa, solo si la
+   # categoria tiene una mediana valida.
+   Mask_Rellenar_Der = (
+       ~np.isnan(Izq) & np.isnan(Der) & ~np.isnan(Medianas_Der)
+   )
+   Mask_Rellenar_Izq = (
+       ~np.isnan(Der) & np.isnan(Izq) & ~np.isnan(Medianas_Izq)
+   )
+   Mask_Rellenos = np.hstack([Mask_Rellenar_Izq, Mask_Rellenar_Der])
+   
+   df[Columnas] = np.where(Mask_Rellenos, Medianas, Valores)
+   
+   # Reporte de rellenos por columna y categoria.
+   Reporte = pd.DataFrame(
+       Mask_Rellenos, columns=Columnas, index=df.index
+   ).groupby(df['Categoria_PASO_2023']).sum()
+   Reporte = Reporte.stack().rename('Rellenos').reset_index()
+   Reporte.columns = ['Categoria_PASO_2023', 'Columna', 'Rellenos']
+   Reporte = Reporte[Reporte['Rellenos'] > 0][Columnas_Reporte]
+   
+   return Reporte.sort_values(Columnas_Reporte[:2]).reset_index(drop=True)
+
+def Eliminar_Primeros_Datos_IP_Items_Asociados(df, Modificar_Original = False):
 
     """
     Elimina los datos (no las columnas) de IP Items basándose en 'Orden_IP_Items_Asociados'.
     Toma los primeros números únicos necesarios para obtener exactamente 3 números diferentes.
     Para cada IP Item, elimina tanto la versión _Izq como _Der.
+    Las listas de orden se expanden una sola vez y los datos se eliminan
+    con una única máscara sobre las columnas afectadas.
     
     Parámetros:
     - df: DataFrame con columnas 'Orden_IP_Items_Asociados' y columnas IP_Item_X_Y_Z
+    - Modificar_Original: si es True, elimina los datos sobre df en lugar
+      de trabajar sobre una copia.
     
     Retorna:
     - DataFrame modificado con los datos eliminados (Valores = NaN)
     
     """
     
-    import pandas as pd
-    
-    # Crear una copia del DataFrame para no modificar el original.
-    df_Modificado = df.copy()
+    # Trabajar sobre una copia salvo que se pida modificar el original.
+    df_Modificado = df if Modificar_Original else df.copy()
     
     # Sufijos de columnas a eliminar.
     Sufijos = ['_Respuesta', '_Candidato', '_Tiempo']
     
-    # Iterar por cada fila del DataFrame.
-    for Index, Fila in df_Modificado.iterrows():
-        
-        # Obtener la lista de orden de IP Items para esta fila.
-        Orden_IP_Items = Fila['Orden_IP_Items_Asociados']
-        
-        # Si la lista no está vacía o no es NaN.
-        if isinstance(Orden_IP_Items, list) and len(Orden_IP_Items) > 0:
-            
-            # Estrategia: Tomar ítems hasta obtener 3 números únicos.
-            Numeros_IP_Unicos = set()
-            Items_A_Procesar = []
-            
-            # Recorrer la lista de orden hasta obtener 3 números únicos.
-            for Item in Orden_IP_Items:
-                if isinstance(Item, str) and '_' in Item:
-                    Numero = Item.split('_')[0]  # Extraer solo el número.
-                    
-                    # Agregar el ítem a procesar.
-                    Items_A_Procesar.append(Item)
-                    Numeros_IP_Unicos.add(Numero)
-                    
-                    # Parar cuando tengamos 3 números únicos.
-                    if len(Numeros_IP_Unicos) >= 3:
-                        break
-            
-            # Eliminar datos para los 3 números únicos encontrados.
-            for Numero in Numeros_IP_Unicos:
-                for Direccion in ['_Izq', '_Der']:
-                    for Sufijo in Sufijos:
-                        # Construir el nombre de la columna.
-                        Columna = f'IP_Item_{Numero}{Direccion}{Sufijo}'
-                        
-                        # Si la columna existe en el DataFrame, eliminar el dato.
-                        if Columna in df_Modificado.columns:
-                            df_Modificado.at[Index, Columna] = pd.NA
+    # Expandir las listas de orden una sola vez, indexando por posición
+    # de fila para no depender de que el índice sea único.
+    Ordenes = pd.Series(
+        df_Modificado['Orden_IP_Items_Asociados'].to_numpy(),
+        index=np.arange(len(df_Modificado))
+    )
+    Ordenes = Ordenes[Ordenes.map(
+        lambda Orden: isinstance(Orden, list) and len(Orden) > 0
+    )]
+    Items = Ordenes.explode()
+    Items = Items[Items.map(
+        lambda Item: isinstance(Item, str) and '_' in Item
+    )]
+    if Items.empty:
+        return df_Modificado
+    
+    # Extraer solo el número y quedarse con los 3 primeros números
+    # únicos de cada fila, respetando el orden de aparición.
+    Numeros = pd.DataFrame({
+        'Fila': Items.index,
+        'Numero': Items.str.split('_').str[0].to_numpy()
+    }).drop_duplicates()
+    Numeros = Numeros[Numeros.groupby('Fila').cumcount() < 3]
+    
+    # Construir la máscara sobre las columnas IP_Item_{n}_{Izq|Der}_{Sufijo}.
+    Posiciones_Columnas = {
+        Columna: Posicion for Posicion, Columna
+        in enumerate(df_Modificado.columns)
+    }
+    Columnas_Afectadas = []
+    Filas_Mascara = []
+    Columnas_Mascara = []
+    for Numero, Filas in Numeros.groupby('Numero')['Fila']:
+        for Direccion in ['_Izq', '_Der']:
+            for Sufijo in Sufijos:
+                Columna = f'IP_Item_{Numero}{Direccion}{Sufijo}'
+                if Columna not in Posiciones_Columnas:
+                    continue
+                if Columna not in Columnas_Afectadas:
+                    Columnas_Afectadas.append(Columna)
+                Filas_Mascara.append(Filas.to_numpy())
+                Columnas_Mascara.append(np.full(
+                    len(Filas), Columnas_Afectadas.index(Columna)
+                ))
+    
+    if not Columnas_Afectadas:
+        return df_Modificado
+    
+    Mascara = np.zeros(
+        (len(df_Modificado), len(Columnas_Afectadas)), dtype=bool
+    )
+    Mascara[
+        np.concatenate(Filas_Mascara), np.concatenate(Columnas_Mascara)
+    ] = True
+    
+    # Eliminar todos los datos en una sola operación.
+    df_Modificado[Columnas_Afectadas] = df_Modificado[
+        Columnas_Afectadas
+    ].mask(Mascara, pd.NA)
     
     return df_Modificado
 
-def Eliminar_Filas_Por_Desviacion_Estandar(
+def Calcular_Limites_Atipicos(
+    Matriz: np.ndarray,
+    Criterio: str = 'Desviacion',
+    Numero_Desviaciones: float = 3,
+    Por_Columna: bool = False
+) -> tuple:
+
+    """
+    
+    Calcula el centro, la dispersión y el límite superior de una matriz
+    de valores (con NaN) según el criterio indicado.
+    
+    Parámetros:
+    - Matriz: matriz de floats (filas x columnas).
+    - Criterio: 'Desviacion' (media + k desvíos estándar poblacionales),
+      'MAD' (mediana + k * 1.4826 * MAD) o 'IQR' (Q3 + k * IQR).
+    - Numero_Desviaciones: multiplicador k del criterio.
+    - Por_Columna: si es True, calcula un límite por columna; si no,
+      un único límite con todos los valores juntos.
+    
+    Retorna:
+    - Tupla (Centro, Dispersion, Limite_Superior, Cantidad_Valores),
+      escalares o arrays por columna.
+    
+    """
+
+    Eje = 0 if Por_Columna else None
+    if not Por_Columna:
+        Matriz = Matriz[~np.isnan(Matriz)]
+
+    Cantidad_Valores = np.sum(~np.isnan(Matriz), axis=Eje)
+    if not Por_Columna and Cantidad_Valores == 0:
+        return np.nan, np.nan, np.nan, 0
+
+    # Ignorar avisos por columnas o grupos sin valores (quedan en NaN).
+    with np.errstate(all='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        if Criterio == 'Desviacion':
+            Centro = np.nanmean(Matriz, axis=Eje)
+            Dispersion = np.nanstd(Matriz, axis=Eje)
+            Limite_Superior = Centro + Numero_Desviaciones * Dispersion
+        elif Criterio == 'MAD':
+            Centro = np.nanmedian(Matriz, axis=Eje)
+            Dispersion = 1.4826 * np.nanmedian(
+                np.abs(Matriz - Centro), axis=Eje
+            )
+            Limite_Superior = Centro + Numero_Desviaciones * Dispersion
+        elif Criterio == 'IQR':
+            Q1, Centro, Q3 = np.nanpercentile(
+                Matriz, [25, 50, 75], axis=Eje
+            )
+            Dispersion = Q3 - Q1
+            Limite_Superior = Q3 + Numero_Desviaciones * Dispersion
+        else:
+            raise ValueError(
+                f"Criterio desconocido: {Criterio}. "
+                "Usar 'Desviacion', 'MAD' o 'IQR'."
+            )
+
+    return Centro, Dispersion, Limite_Superior, Cantidad_Valores
+
+def Detectar_Filas_Atipicas(
     Data_Frame: pd.DataFrame,
     Columnas_Tiempo: List[str],
-    Numero_Desviaciones: int = 3
-) -> pd.DataFrame:
+    Numero_Desviaciones: float = 3,
+    Criterio: str = 'Desviacion',
+    Agrupamiento: str = 'Global',
+    Columna_Categoria: str = 'Categoria_PASO_2023'
+) -> tuple:
 
     """
     
-    Elimina filas donde algún valor de tiempo exceda el número
-    especificado de desvíos estándar desde la media global de todas
-    las columnas de tiempo.
+    Detecta las filas donde algún valor de tiempo supera el límite
+    superior calculado según el criterio y el agrupamiento indicados.
+    Convierte las columnas a una única matriz numérica y resuelve todo
+    con reducciones de NumPy.
     
     Parámetros:
     - Data_Frame: DataFrame a procesar.
     - Columnas_Tiempo: Lista de nombres de columnas a analizar.
-    - Numero_Desviaciones: Número de desvíos estándar como límite
-      (por defecto 3).
+    - Numero_Desviaciones: multiplicador del criterio (por defecto 3).
+    - Criterio: 'Desviacion', 'MAD' o 'IQR'
+      (ver Calcular_Limites_Atipicos).
+    - Agrupamiento: 'Global' (un límite con todas las columnas juntas),
+      'Columna' (un límite por columna) o 'Categoria' (un límite por
+      categoría de 'Columna_Categoria', con todas las columnas juntas).
+    - Columna_Categoria: columna de agrupación para 'Categoria'.
     
     Retorna:
-    - DataFrame con las filas válidas únicamente.
+    - Tupla (Mascara_Atipicos, Resumen): Serie booleana alineada con
+      Data_Frame (True = fila a eliminar) y DataFrame con el centro, la
+      dispersión, el límite y las filas eliminadas de cada grupo.
     
     """
 
-    # Filtrar columnas que existen en el DataFrame.
     Columnas_Existentes: List[str] = [
         Columna for Columna in Columnas_Tiempo
         if Columna in Data_Frame.columns
     ]
+    Columnas_Resumen = [
+        'Grupo', 'Centro', 'Dispersion', 'Limite_Superior',
+        'Cantidad_Valores', 'Filas_Eliminadas'
+    ]
+    Mascara_Vacia = pd.Series(False, index=Data_Frame.index)
     if len(Columnas_Existentes) == 0:
+        return Mascara_Vacia, pd.DataFrame(columns=Columnas_Resumen)
+
+    # Matriz numérica con todas las columnas de tiempo.
+    Matriz = Data_Frame[Columnas_Existentes].apply(
+        pd.to_numeric, errors='coerce'
+    ).to_numpy(dtype=float)
+
+    Filas_Resumen = []
+
+    if Agrupamiento == 'Global':
+        Centro, Dispersion, Limite, Cantidad = Calcular_Limites_Atipicos(
+            Matriz, Criterio, Numero_Desviaciones
+        )
+        with np.errstate(invalid='ignore'):
+            Excede = Matriz > Limite
+        Mascara = Excede.any(axis=1)
+        Filas_Resumen.append(
+            ['Global', Centro, Dispersion, Limite, Cantidad, Mascara.sum()]
+        )
+
+    elif Agrupamiento == 'Columna':
+        Centro, Dispersion, Limite, Cantidad = Calcular_Limites_Atipicos(
+            Matriz, Criterio, Numero_Desviaciones, Por_Columna=True
+        )
+        with np.errstate(invalid='ignore'):
+            Excede = Matriz > Limite
+        Mascara = Excede.any(axis=1)
+        for Posicion, Columna in enumerate(Columnas_Existentes):
+            Filas_Resumen.append([
+                Columna, Centro[Posicion], Dispersion[Posicion],
+                Limite[Posicion], Cantidad[Posicion],
+                Excede[:, Posicion].sum()
+            ])
+
+    elif Agrupamiento == 'Categoria':
+        Codigos, Categorias = pd.factorize(Data_Frame[Columna_Categoria])
+        Limites_Filas = np.full(len(Data_Frame), np.nan)
+        Datos_Grupos = []
+        for Codigo, Categoria in enumerate(Categorias):
+            Filas_Grupo = Codigos == Codigo
+            Centro, Dispersion, Limite, Cantidad = (
+                Calcular_Limites_Atipicos(
+                    Matriz[Filas_Grupo], Criterio, Numero_Desviaciones
+                )
+            )
+            Limites_Filas[Filas_Grupo] = Limite
+            Datos_Grupos.append(
+                (Categoria, Filas_Grupo, Centro, Dispersion, Limite, Cantidad)
+            )
+        with np.errstate(invalid='ignore'):
+            Excede = Matriz > Limites_Filas[:, None]
+        Mascara = Excede.any(axis=1)
+        for Categoria, Filas_Grupo, Centro, Dispersion, Limite, Cantidad in (
+            Datos_Grupos
+        ):
+            Filas_Resumen.append([
+                Categoria, Centro, Dispersion, Limite, Cantidad,
+                Mascara[Filas_Grupo].sum()
+            ])
+
+    else:
+        raise ValueError(
+            f"Agrupamiento desconocido: {Agrupamiento}. "
+            "Usar 'Global', 'Columna' o 'Categoria'."
+        )
+
+    Mascara_Atipicos = pd.Series(Mascara, index=Data_Frame.index)
+    Resumen = pd.DataFrame(Filas_Resumen, columns=Columnas_Resumen)
+
+    return Mascara_Atipicos, Resumen
+
+def Eliminar_Filas_Por_Desviacion_Estandar(
+    Data_Frame: pd.DataFrame,
+    Columnas_Tiempo: List[str],
+    Numero_Desviaciones: float = 3,
+    Criterio: str = 'Desviacion',
+    Agrupamiento: str = 'Global',
+    Columna_Categoria: str = 'Categoria_PASO_2023',
+    Retornar_Resumen: bool = False
+):
+
+    """
+    
+    Elimina filas donde algún valor de tiempo exceda el número
+    especificado de desvíos estándar desde la media global de todas
+    las columnas de tiempo. Con 'Criterio' y 'Agrupamiento' se puede
+    usar un límite por columna o por categoría, o límites robustos
+    (MAD/IQR); ver Detectar_Filas_Atipicas.
+    
+    Parámetros:
+    - Data_Frame: DataFrame a procesar.
+    - Columnas_Tiempo: Lista de nombres de columnas a analizar.
+    - Numero_Desviaciones: Número de desvíos estándar como límite
+      (por defecto 3).
+    - Criterio: 'Desviacion' (por defecto), 'MAD' o 'IQR'.
+    - Agrupamiento: 'Global' (por defecto), 'Columna' o 'Categoria'.
+    - Columna_Categoria: columna de agrupación para 'Categoria'.
+    - Retornar_Resumen: si es True, retorna también la máscara de
+      filas eliminadas y el resumen de límites.
+    
+    Retorna:
+    - DataFrame con las filas válidas únicamente, o la tupla
+      (DataFrame, Mascara_Atipicos, Resumen) si Retornar_Resumen es True.
+    
+    """
+
+    Mascara_Atipicos, Resumen = Detectar_Filas_Atipicas(
+        Data_Frame,
+        Columnas_Tiempo,
+        Numero_Desviaciones,
+        Criterio,
+        Agrupamiento,
+        Columna_Categoria
+    )
+
+    if Resumen.empty:
         print("⚠️ Ninguna columna de tiempo encontrada;")
         print("   regresando el DataFrame sin cambios.")
-        return Data_Frame
-
-    # Recopilar todos los valores numéricos no nulos.
-    Todos_Los_Valores: List[float] = []
-    for Columna in Columnas_Existentes:
-        Valores_Limpios = pd.to_numeric(
-            Data_Frame[Columna],
-            errors = 'coerce'
-        ).dropna().tolist()
-        Todos_Los_Valores.extend(Valores_Limpios)
-
-    if len(Todos_Los_Valores) == 0:
+    elif Resumen['Cantidad_Valores'].sum() == 0:
         print("⚠️ No hay valores numéricos para calcular estadísticos;")
         print("   regresando el DataFrame sin cambios.")
-        return Data_Frame
-
-    # Calcular estadísticos globales.
-    Media_Global: float = sum(Todos_Los_Valores) / len(Todos_Los_Valores)
-    Varianza: float = sum(
-        (Valor - Media_Global) ** 2 for Valor in Todos_Los_Valores
-    ) / len(Todos_Los_Valores)
-    Desviacion_Estandar_Global: float = Varianza ** 0.5
-    Limite_Superior: float = Media_Global + (
-        Numero_Desviaciones * Desviacion_Estandar_Global
-    )
-
-    print(f"Media global: {Media_Global:.2f}")
-    print(f"Desvío estándar global: {Desviacion_Estandar_Global:.2f}")
-    print(
-        f"Límite superior ({Numero_Desviaciones} desvíos): "
-        f"{Limite_Superior:.2f}"
-    )
 
-    # Detectar y eliminar filas con al menos un valor atípico.
-    Filas_Validas: List[int] = []
-    for Indice, Fila in Data_Frame.iterrows():
-        Fila_Valida = True
-        for Columna in Columnas_Existentes:
-            Valor = pd.to_numeric(Fila[Columna], errors = 'coerce')
-            # Ensure Valor is a scalar, not a Series
-            if isinstance(Valor, pd.Series):
-                if not Valor.empty:
-                    Valor = Valor.iloc[0]
-                else:
-                    continue
-            if pd.notna(Valor) and Valor > Limite_Superior:
-                print(
-                    f"Eliminando fila ID={Fila.get('ID', Indice)}: "
-                    f"{Columna}={Valor:.2f} supera {Limite_Superior:.2f}"
-                )
-                Fila_Valida = False
-                break
-        if Fila_Valida:
-            Filas_Validas.append(Indice) # type: ignore
+    Data_Frame_Resultante = Data_Frame[~Mascara_Atipicos]
 
-    Data_Frame_Resultante = Data_Frame.loc[Filas_Validas]
+    if Retornar_Resumen:
+        return Data_Frame_Resultante, Mascara_Atipicos, Resumen
 
     return Data_Frame_Resultante
 
-def Crear_Columnas_Cambio_Opinion(Diccionario_Dataframes):
+# Registro de los ítems IP: número, título y tipo ideológico. Es la
+# única fuente de los números de ítem y de las familias de columnas.
+Registro_Items: Dict[int, Dict[str, Any]] = {
+    Numero_Item: {'Numero_Item': Numero_Item, 'Titulo': Titulo, 'Tipo': Tipo}
+    for Numero_Item, Titulo, Tipo in [
+        (3, 'Aborto debe ser ilegal', 'Conservador'),
+        (4, 'Prohibir docentes homosexuales', 'Conservador'),
+        (5, 'Consultas populares vinculantes', 'Progresista'),
+        (6, 'Jubilación pública', 'Progresista'),
+        (7, 'Preferencia por gobiernos militares', 'Conservador'),
+        (8, 'Exclusividad de los padres en educación sexual', 'Conservador'),
+        (9, 'Servicios públicos estatales', 'Progresista'),
+        (10, 'Priorizar seguridad sobre otras áreas', 'Conservador'),
+        (11, 'Campañas sobre consumo responsable', 'Progresista'),
+        (16, 'Autogobierno indígena', 'Progresista'),
+        (19, 'Rechazo a educación sexual', 'Conservador'),
+        (20, 'Ingreso mínimo para niños', 'Progresista'),
+        (22, 'Sostenimiento estatal de la Iglesia Católica', 'Conservador'),
+        (23, 'Restricción a inmigrantes', 'Conservador'),
+        (24, 'Justificación de piquetes y cortes', 'Progresista'),
+        (25, 'Evitar concentración mediática', 'Progresista'),
+        (27, 'Aumento del gasto social en crisis', 'Progresista'),
+        (28, 'La tierra para quien la trabaja', 'Progresista'),
+        (29, 'Privatizar empresas públicas', 'Conservador'),
+        (30, 'No usar medios estatales para propaganda', 'Conservador')
+    ]
+}
+
+# Lista de números de ítems IP disponibles.
+Items_IP = sorted(Registro_Items)
+Items_Progresistas = [
+    Numero_Item for Numero_Item in Items_IP
+    if Registro_Items[Numero_Item]['Tipo'] == 'Progresista'
+]
+Items_Conservadores = [
+    Numero_Item for Numero_Item in Items_IP
+    if Registro_Items[Numero_Item]['Tipo'] == 'Conservador'
+]
+
+# Plantilla del nombre de columna de cada familia por ítem.
+Plantillas_Columnas = {
+    'IP_Respuesta': 'IP_Item_{}_Respuesta',
+    'IP_Izq_Respuesta': 'IP_Item_{}_Izq_Respuesta',
+    'IP_Der_Respuesta': 'IP_Item_{}_Der_Respuesta',
+    'IP_Tiempo': 'IP_Item_{}_Tiempo',
+    'IP_Izq_Tiempo': 'IP_Item_{}_Izq_Tiempo',
+    'IP_Der_Tiempo': 'IP_Item_{}_Der_Tiempo',
+    'CO_Izq': 'CO_Item_{}_Izq',
+    'CO_Der': 'CO_Item_{}_Der',
+    'CT_Izq': 'CT_Item_{}_Izq',
+    'CT_Der': 'CT_Item_{}_Der'
+}
+
+def Construir_Familias_Columnas() -> Dict[str, List[str]]:
 
     """
-    Crea columnas de cambio de opinión para cada ítem IP comparando 
-    las respuestas con candidatos de izquierda/derecha versus las 
-    respuestas base de cada ítem.
     
+    Construye, a partir de Registro_Items, las listas de columnas de
+    cada familia. Para cada plantilla hay tres familias: todos los
+    ítems ('IP_Tiempo'), solo progresistas ('IP_Tiempo_Pro') y solo
+    conservadores ('IP_Tiempo_Con'); en CO y CT los tipos van antes del
+    lado ('CO_Pro_Izq'), como en los nombres de columnas agregadas.
+    También incluye 'CO' y 'CT' (Izq y Der intercalados por ítem),
+    'CO_Pro', 'CO_Con', 'CT_Pro' y 'CT_Con' (Izq y luego Der), y las
+    columnas sumadas y filtradas ('Sumados_CO', 'Filtrados_CT', ...).
+
     """
 
-    # Lista de números de ítems IP disponibles.
-    Items_IP = [3, 4, 5, 6, 7, 8, 9, 10, 11, 16, 19, 20, 22, 23, 24, 
-                25, 27, 28, 29, 30]
-    
-    for Nombre_Df, Dataframe in Diccionario_Dataframes.items():
-        
-        for Numero_Item in Items_IP:
-            
-            # Nombres de las columnas base y con candidatos.
-            Columna_Base = f'IP_Item_{Numero_Item}_Respuesta'
-            Columna_Izq = f'IP_Item_{Numero_Item}_Izq_Respuesta'
-            Columna_Der = f'IP_Item_{Numero_Item}_Der_Respuesta'
-            
-            # Nombres de las nuevas columnas de cambio de opinión.
-            Nueva_Columna_Izq = f'CO_Item_{Numero_Item}_Izq'
-            Nueva_Columna_Der = f'CO_Item_{Numero_Item}_Der'
-            
-            # Verificar que todas las columnas necesarias existen.
-            if all(Columna in Dataframe.columns for Columna in 
-                   [Columna_Base, Columna_Izq, Columna_Der]):
-                
-                # Convertir a numérico manteniendo NaN para valores inválidos.
-                Base_Numerica = pd.to_numeric(Dataframe[Columna_Base], 
-                                            errors='coerce')
-                Izq_Numerica = pd.to_numeric(Dataframe[Columna_Izq], 
-                                           errors='coerce')
-                Der_Numerica = pd.to_numeric(Dataframe[Columna_Der], 
-                                           errors='coerce')
-                
-                # Calcular cambio de opinión para izquierda.
-                Dataframe[Nueva_Columna_Izq] = Izq_Numerica - Base_Numerica
-                
-                # Calcular cambio de opinión para derecha.
-                Dataframe[Nueva_Columna_Der] = Der_Numerica - Base_Numerica
-    
-    return Diccionario_Dataframes
+    Grupos = {'': Items_IP, '_Pro': Items_Progresistas,
+              '_Con': Items_Conservadores}
+    Familias: Dict[str, List[str]] = {}
 
-def Crear_Columnas_Cambio_Tiempo(Diccionario_Dataframes):
+    for Familia, Plantilla in Plantillas_Columnas.items():
+        for Sufijo, Items in Grupos.items():
+            if Familia.startswith(('CO_', 'CT_')):
+                Prefijo, Lado = Familia.split('_')
+                Nombre = f"{Prefijo}{Sufijo}_{Lado}"
+            else:
+                Nombre = f"{Familia}{Sufijo}"
+            Familias[Nombre] = [Plantilla.format(Numero) for Numero in Items]
 
-   """
-   Crea columnas de cambio de tiempo para cada ítem IP comparando 
-   los tiempos de respuesta con candidatos de izquierda/derecha versus 
-   los tiempos base de cada ítem.
-   
-   """
+    for Prefijo in ['CO', 'CT']:
+        Familias[Prefijo] = [
+            Columna for Numero in Items_IP for Columna in [
+                f'{Prefijo}_Item_{Numero}_Izq', f'{Prefijo}_Item_{Numero}_Der'
+            ]
+        ]
+        for Tipo in ['Pro', 'Con']:
+            Familias[f'{Prefijo}_{Tipo}'] = (
+                Familias[f'{Prefijo}_{Tipo}_Izq'] +
+                Familias[f'{Prefijo}_{Tipo}_Der']
+            )
 
-   # Lista de números de ítems IP disponibles.
-   Items_IP = [3, 4, 5, 6, 7, 8, 9, 10, 11, 16, 19, 20, 22, 23, 24, 
-               25, 27, 28, 29, 30]
-   
-   for Nombre_Df, Dataframe in Diccionario_Dataframes.items():
-       
-       for Numero_Item in Items_IP:
-           
-           # Nombres de las columnas base y con candidatos para tiempo.
-           Columna_Base = f'IP_Item_{Numero_Item}_Tiempo'
-           Columna_Izq = f'IP_Item_{Numero_Item}_Izq_Tiempo'
-           Columna_Der = f'IP_Item_{Numero_Item}_Der_Tiempo'
-           
-           # Nombres de las nuevas columnas de cambio de tiempo.
-           Nueva_Columna_Izq = f'CT_Item_{Numero_Item}_Izq'
-           Nueva_Columna_Der = f'CT_Item_{Numero_Item}_Der'
-           
-           # Verificar que todas las columnas necesarias existen.
-           if all(Columna in Dataframe.columns for Columna in 
-                  [Columna_Base, Columna_Izq, Columna_Der]):
-               
-               # Convertir a numérico manteniendo NaN para valores inválidos.
-               Base_Numerica = pd.to_numeric(Dataframe[Columna_Base], 
-                                           errors='coerce')
-               Izq_Numerica = pd.to_numeric(Dataframe[Columna_Izq], 
-                                          errors='coerce')
-               Der_Numerica = pd.to_numeric(Dataframe[Columna_Der], 
-                                          errors='coerce')
-               
-               # Calcular cambio de tiempo para izquierda.
-               Dataframe[Nueva_Columna_Izq] = Izq_Numerica - Base_Numerica
-               
-               # Calcular cambio de tiempo para derecha.
-               Dataframe[Nueva_Columna_Der] = Der_Numerica - Base_Numerica
-   
-   return Diccionario_Dataframes
+    for Agregado, Nombre_Agregado in [('Sumados', 'Sum'),
+                                      ('Filtrados', 'Filt')]:
+        for Prefijo, Medida in [('CO', 'Op'), ('CT', 'Tiempo')]:
+            Familias[f'{Agregado}_{Prefijo}'] = [
+                f'Cambio_{Medida}_{Nombre_Agregado}_{Tipo}_{Lado}'
+                for Tipo in ['Pro', 'Con'] for Lado in ['Izq', 'Der']
+            ]
 
-def Limpiar_Texto(texto):
-   
-   """
-   Limpia el texto removiendo guiones bajos y capitalizando solo la primera letra.
-   
-   """
+    return Familias
 
-   return texto.replace('_', ' ').capitalize()
+# Columnas de cada familia (ej: Familias_Columnas['CO_Pro_Izq']).
+Familias_Columnas = Construir_Familias_Columnas()
 
-def Crear_Boxplots_Items(
+def Obtener_Indices_Familias(
     Data_Frame: pd.DataFrame,
-    Diccionario_Items: dict[int, dict[str, Any]],
-    Tipo_Columna: str = 'IP_Respuesta',
-    Nombre_Df: str = 'df'
-) -> None:
+    Familias: List[str] = None
+) -> Dict[str, np.ndarray]:
 
     """
     
-    Crea boxplots para cada ítem segmentado por categoría PASO 2023,
-    incluyendo IP, CO y CT. Guarda cada gráfico en formatos PNG y SVG
-    en la carpeta 'Boxplots/'. Aplica límites verticales según tipo de
-    columna y usa colores específicos por categoría.
+    Obtiene la posición de las columnas de cada familia en Data_Frame,
+    para tomar los bloques directamente de la matriz NumPy
+    (ej: Matriz[:, Indices['CO_Pro_Izq']]).
 
     Parámetros:
-    - Data_Frame: DataFrame sobre el que graficar.
-    - Diccionario_Items: metadata de cada ítem (número, título, tipo).
-    - Tipo_Columna: uno de:
-        'IP_Respuesta',
-        'IP_Izq_Respuesta','IP_Der_Respuesta',
-        'IP_Tiempo','IP_Izq_Tiempo','IP_Der_Tiempo',
-        'CO_Pro_Izq','CO_Con_Izq','CO_Pro_Der','CO_Con_Der',
-        'CT_Pro_Izq','CT_Con_Izq','CT_Pro_Der','CT_Con_Der'
-    - Nombre_Df: nombre para los archivos de salida.
+    - Data_Frame: DataFrame con las columnas.
+    - Familias: nombres de familias de Familias_Columnas (por defecto,
+      todas).
 
-    """
+    Retorna:
+    - Diccionario {familia: array de posiciones}, con -1 en las
+      columnas que Data_Frame no tiene.
 
-    import os
-    import numpy as np
-    import seaborn as sns
-    import matplotlib.pyplot as plt
+    """
 
-    # Crear carpeta si no existe.
-    os.makedirs("Boxplots", exist_ok=True)
+    if Familias is None:
+        Familias = list(Familias_Columnas)
 
-    Mapa_Colores_Categorias = {
-        'Progressivism': '#0078bf',
-        'Moderate_Right_A': '#f7d117',
-        'Moderate_Right_B': '#f7d117',
-        'Left_Wing': '#f65058',
-        'Blank': '#FFFFFF',
-        'Centre': '#009cdd',
-        'Right_Wing_Libertarian': '#753bbd'
+    return {
+        Familia: Data_Frame.columns.get_indexer(Familias_Columnas[Familia])
+        for Familia in Familias
     }
 
-    Items_Disponibles: dict[int, dict[str, Any]] = {}
-    for Numero_Item, Info_Item in Diccionario_Items.items():
+def Crear_Columnas_Cambio(
+    Diccionario_Dataframes,
+    Items = None,
+    Medida = 'Respuesta',
+    Prefijo = 'CO'
+):
 
-        if Tipo_Columna == 'IP_Respuesta':
-            Nombre_Columna = f'IP_Item_{Numero_Item}_Respuesta'
-        elif Tipo_Columna == 'IP_Izq_Respuesta':
-            Nombre_Columna = f'IP_Item_{Numero_Item}_Izq_Respuesta'
-        elif Tipo_Columna == 'IP_Der_Respuesta':
-            Nombre_Columna = f'IP_Item_{Numero_Item}_Der_Respuesta'
-        elif Tipo_Columna == 'IP_Tiempo':
-            Nombre_Columna = f'IP_Item_{Numero_Item}_Tiempo'
-        elif Tipo_Columna == 'IP_Izq_Tiempo':
-            Nombre_Columna = f'IP_Item_{Numero_Item}_Izq_Tiempo'
-        elif Tipo_Columna == 'IP_Der_Tiempo':
-            Nombre_Columna = f'IP_Item_{Numero_Item}_Der_Tiempo'
-        elif Tipo_Columna == 'CO_Pro_Izq':
-            Nombre_Columna = f'CO_Item_{Numero_Item}_Izq'
-        elif Tipo_Columna == 'CO_Con_Izq':
-            Nombre_Columna = f'CO_Item_{Numero_Item}_Izq'
-        elif Tipo_Columna == 'CO_Pro_Der':
-            Nombre_Columna = f'CO_Item_{Numero_Item}_Der'
-        elif Tipo_Columna == 'CO_Con_Der':
-            Nombre_Columna = f'CO_Item_{Numero_Item}_Der'
-        elif Tipo_Columna == 'CT_Pro_Izq':
-            Nombre_Columna = f'CT_Item_{Numero_Item}_Izq'
-        elif Tipo_Columna == 'CT_Con_Izq':
-            Nombre_Columna = f'CT_Item_{Numero_Item}_Izq'
-        elif Tipo_Columna == 'CT_Pro_Der':
-            Nombre_Columna = f'CT_Item_{Numero_Item}_Der'
-        elif Tipo_Columna == 'CT_Con_Der':
-            Nombre_Columna = f'CT_Item_{Numero_Item}_Der'
-        else:
-            continue
+    """
+    Crea columnas de cambio para cada ítem IP comparando la medida con
+    candidatos de izquierda/derecha versus la medida base de cada ítem.
+    Convierte los bloques base, Izq y Der a matrices una sola vez, calcula
+    todos los cambios como restas de matrices y agrega las columnas
+    nuevas con un único concat.
+    
+    Parámetros:
+    - Diccionario_Dataframes: diccionario {nombre: DataFrame}.
+    - Items: números de ítems IP a procesar (por defecto, Items_IP).
+    - Medida: sufijo de las columnas a comparar ('Respuesta' o 'Tiempo').
+    - Prefijo: prefijo de las columnas nuevas ('CO', 'CT', ...), que se
+      llaman {Prefijo}_Item_{n}_Izq y {Prefijo}_Item_{n}_Der.
+    
+    Retorna:
+    - El diccionario con los DataFrames con las columnas de cambio.
+    
+    """
 
-        if Nombre_Columna in Data_Frame.columns:
-            Items_Disponibles[Numero_Item] = {
-                'Info': Info_Item,
-                'Columna': Nombre_Columna
-            }
+    if Items is None:
+        Items = Items_IP
+    
+    for Nombre_Df, Dataframe in Diccionario_Dataframes.items():
+        
+        # Posición de las columnas base, Izq y Der de cada ítem; solo se
+        # usan los ítems que tienen las tres.
+        Indices = [
+            Dataframe.columns.get_indexer([
+                Plantillas_Columnas[Familia].format(Numero_Item)
+                for Numero_Item in Items
+            ])
+            for Familia in [f'IP_{Medida}', f'IP_Izq_{Medida}',
+                            f'IP_Der_{Medida}']
+        ]
+        Completos = np.all(np.stack(Indices) >= 0, axis=0)
+        if not Completos.any():
+            continue
+        Items_Completos = [
+            Numero_Item for Numero_Item, Completo in zip(Items, Completos)
+            if Completo
+        ]
+        
+        # Convertir cada bloque a una matriz numérica (NaN para valores
+        # inválidos).
+        def Matriz_Numerica(Posiciones):
+            return Dataframe.iloc[:, Posiciones[Completos]].apply(
+                pd.to_numeric, errors='coerce'
+            ).to_numpy(dtype=float, na_value=np.nan)
+        
+        Base, Izq, Der = (Matriz_Numerica(Posiciones) for Posiciones in Indices)
+        
+        # Calcular todos los cambios, intercalando Izq y Der por ítem.
+        Cambios = np.empty((len(Dataframe), 2 * len(Items_Completos)))
+        Cambios[:, 0::2] = Izq - Base
+        Cambios[:, 1::2] = Der - Base
+        
+        Nombres_Columnas = []
+        for Numero_Item in Items_Completos:
+            Nombres_Columnas.append(f'{Prefijo}_Item_{Numero_Item}_Izq')
+            Nombres_Columnas.append(f'{Prefijo}_Item_{Numero_Item}_Der')
+        
+        Columnas_Cambio = pd.DataFrame(
+            Cambios, index=Dataframe.index, columns=Nombres_Columnas
+        )
+        
+        # Sobrescribir las columnas que ya existen y agregar el resto
+        # de una sola vez.
+        Columnas_Existentes = [
+            Columna for Columna in Nombres_Columnas
+            if Columna in Dataframe.columns
+        ]
+        if Columnas_Existentes:
+            Dataframe[Columnas_Existentes] = (
+                Columnas_Cambio[Columnas_Existentes]
+            )
+            Columnas_Cambio = Columnas_Cambio.drop(
+                columns=Columnas_Existentes
+            )
+        
+        Diccionario_Dataframes[Nombre_Df] = pd.concat(
+            [Dataframe, Columnas_Cambio], axis=1
+        )
+    
+    return Diccionario_Dataframes
 
-    if not Items_Disponibles:
-        print(f"No hay columnas del tipo {Tipo_Columna}")
-        return
+def Crear_Columnas_Cambio_Opinion(Diccionario_Dataframes):
 
-    Num_Items = len(Items_Disponibles)
-    Filas = int(np.ceil(Num_Items / 3))
-    Columnas = min(3, Num_Items)
+    """
+    Crea columnas de cambio de opinión para cada ítem IP comparando 
+    las respuestas con candidatos de izquierda/derecha versus las 
+    respuestas base de cada ítem.
+    
+    """
 
-    Figura, Graficos = plt.subplots(
-        Filas, Columnas,
-        figsize=(50, 5 * Filas)
+    return Crear_Columnas_Cambio(
+        Diccionario_Dataframes, Items_IP, 'Respuesta', 'CO'
     )
 
-    Graficos_Aplanados = np.array(Graficos).flatten()
+def Crear_Columnas_Cambio_Tiempo(Diccionario_Dataframes):
 
-    for IDX, (Num_Item, Item_Data) in enumerate(
-        Items_Disponibles.items()
-    ):
-        Grafico = Graficos_Aplanados[IDX]
-        Columna = Item_Data['Columna']
+   """
+   Crea columnas de cambio de tiempo para cada ítem IP comparando 
+   los tiempos de respuesta con candidatos de izquierda/derecha versus 
+   los tiempos base de cada ítem.
+   
+   """
 
-        Datos = Data_Frame.dropna(
-            subset=[Columna, 'Categoria_PASO_2023']
+   return Crear_Columnas_Cambio(
+       Diccionario_Dataframes, Items_IP, 'Tiempo', 'CT'
+   )
+
+# Definición de los índices de escala y de tiempo: columnas de origen,
+# columnas a invertir ({origen: destino}, el destino puede ser la misma
+# columna), escala (mínimo, máximo) y agregación ('Suma' o 'Media').
+Definicion_Indices = {
+    'Indice_Positividad': {
+        'Columnas': [f'ECE_Item_{Numero}' for Numero in range(1, 8)],
+        'Invertir': {'ECE_Item_5': 'ECE_Item_5_Negativo'},
+        'Escala': (1, 5),
+        'Agregacion': 'Suma'
+    },
+    'Indice_Progresismo': {
+        'Columnas': Familias_Columnas['IP_Respuesta_Pro'],
+        'Invertir': {Columna: Columna
+                     for Columna in Familias_Columnas['IP_Respuesta_Pro']},
+        'Escala': (1, 5),
+        'Agregacion': 'Media'
+    },
+    'Indice_Progresismo_Tiempo': {
+        'Columnas': Familias_Columnas['IP_Tiempo_Pro'],
+        'Agregacion': 'Media'
+    },
+    'Indice_Conservadurismo': {
+        'Columnas': Familias_Columnas['IP_Respuesta_Con'],
+        'Invertir': {Columna: Columna
+                     for Columna in Familias_Columnas['IP_Respuesta_Con']},
+        'Escala': (1, 5),
+        'Agregacion': 'Media'
+    },
+    'Indice_Conservadurismo_Tiempo': {
+        'Columnas': Familias_Columnas['IP_Tiempo_Con'],
+        'Agregacion': 'Media'
+    }
+}
+
+def Calcular_Fiabilidad_Escala(
+    Matriz: np.ndarray,
+    Items: List[str]
+) -> pd.DataFrame:
+
+    """
+    
+    Calcula el alfa de Cronbach de una escala y, para cada ítem, la
+    correlación ítem-total corregida (con la suma del resto de los
+    ítems) y el alfa si se elimina el ítem. Usa solo las filas sin
+    valores faltantes.
+
+    Parámetros:
+    - Matriz: matriz (filas x ítems) con las respuestas ya invertidas.
+    - Items: nombres de los ítems, en el orden de las columnas.
+
+    Retorna:
+    - DataFrame con una fila por ítem y las columnas Item, N,
+      Alfa_Cronbach, Correlacion_Item_Total y Alfa_Si_Se_Elimina.
+
+    """
+
+    Matriz = Matriz[~np.isnan(Matriz).any(axis=1)]
+    N, K = Matriz.shape
+    Resultado = pd.DataFrame({'Item': Items, 'N': N})
+
+    if N < 2 or K < 2:
+        Resultado[['Alfa_Cronbach', 'Correlacion_Item_Total',
+                   'Alfa_Si_Se_Elimina']] = np.nan
+        return Resultado
+
+    Varianzas = Matriz.var(axis=0, ddof=1)
+    Total = Matriz.sum(axis=1)
+    Resto = Total[:, None] - Matriz
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Alfa = K / (K - 1) * (1 - Varianzas.sum() / Total.var(ddof=1))
+
+        # Correlación de cada ítem con la suma del resto.
+        Centrada = Matriz - Matriz.mean(axis=0)
+        Resto_Centrado = Resto - Resto.mean(axis=0)
+        Correlaciones = (Centrada * Resto_Centrado).sum(axis=0) / np.sqrt(
+            (Centrada ** 2).sum(axis=0) * (Resto_Centrado ** 2).sum(axis=0)
         )
-        Datos = Datos[~Datos['Categoria_PASO_2023'].
-            isin(['No apply','No response','Other'])]
 
-        if Datos.empty:
-            Grafico.text(
-                0.5, 0.5, 'Sin datos válidos',
-                ha='center', va='center',
-                transform=Grafico.transAxes
+        if K > 2:
+            Alfa_Sin_Item = (K - 1) / (K - 2) * (
+                1 - (Varianzas.sum() - Varianzas) / Resto.var(axis=0, ddof=1)
             )
         else:
-            Orden_Categorias = [
-                'Left_Wing','Progressivism','Centre',
-                'Moderate_Right_A','Moderate_Right_B',
-                'Right_Wing_Libertarian'
-            ]
-            Paleta_Colores = [
-                Mapa_Colores_Categorias.get(cat, '#999999')
-                for cat in Orden_Categorias
+            Alfa_Sin_Item = np.full(K, np.nan)
+
+    Resultado['Alfa_Cronbach'] = Alfa
+    Resultado['Correlacion_Item_Total'] = Correlaciones
+    Resultado['Alfa_Si_Se_Elimina'] = Alfa_Sin_Item
+
+    return Resultado
+
+def Construir_Indices(
+    Diccionario_Dataframes: Dict[str, pd.DataFrame],
+    Indices: List[str] = None,
+    Calcular_Fiabilidad: bool = False
+):
+
+    """
+    
+    Calcula varios índices de Definicion_Indices en una sola pasada por
+    DataFrame: convierte todas las columnas necesarias a una única
+    matriz float, invierte las columnas indicadas sobre la matriz,
+    agrega cada índice y escribe de vuelta las columnas convertidas,
+    las invertidas y los índices.
+
+    Parámetros:
+    - Diccionario_Dataframes: diccionario {nombre: DataFrame}.
+    - Indices: nombres de índices de Definicion_Indices (por defecto,
+      todos).
+    - Calcular_Fiabilidad: si es True, calcula también el alfa de
+      Cronbach y las correlaciones ítem-total de los índices con
+      columnas invertidas o escala (no de los de tiempo).
+
+    Retorna:
+    - El diccionario con los DataFrames con los índices, o la tupla
+      (diccionario, {nombre: DataFrame de fiabilidad}) si
+      Calcular_Fiabilidad es True.
+
+    """
+
+    if Indices is None:
+        Indices = list(Definicion_Indices)
+
+    Fiabilidad = {}
+
+    for Nombre_Df, Dataframe in Diccionario_Dataframes.items():
+
+        # Solo se calculan los índices que tienen todas sus columnas.
+        Indices_Presentes = []
+        for Indice in Indices:
+            Faltantes = [
+                Columna for Columna in Definicion_Indices[Indice]['Columnas']
+                if Columna not in Dataframe.columns
             ]
-            sns.boxplot(
-                data=Datos,
-                x='Categoria_PASO_2023',
-                y=Columna,
-                order=Orden_Categorias,
-                palette=Paleta_Colores,
-                ax=Grafico
-            )
-            Etiquetas_Categorias = []
-            for Categoria in Orden_Categorias:
-                Subdatos = Datos[Datos['Categoria_PASO_2023'] == Categoria][Columna]
-                if not Subdatos.empty:
-                    Media = Subdatos.mean()
-                    if abs(Media) < 1:
-                        Etiqueta = f"{Categoria.replace('_', ' ')}\n({Media:.3f})"
-                    else:
-                        Etiqueta = f"{Categoria.replace('_', ' ')}\n({Media:.2f})"
-                else:
-                    Etiqueta = Categoria.replace('_', ' ') + "\n(N/A)"
-                Etiquetas_Categorias.append(Etiqueta)
+            if Faltantes:
+                print(f"⚠️ {Nombre_Df}: se omite {Indice}, faltan {Faltantes}")
+            else:
+                Indices_Presentes.append(Indice)
+        if not Indices_Presentes:
+            continue
 
-            Grafico.set_xticklabels(Etiquetas_Categorias, rotation=45, ha='right')
-            Grafico.set_title(
-                f"Item {Item_Data['Info']['Numero_Item']}: "
-                f"{Item_Data['Info']['Titulo']}\n"
-                f"{Item_Data['Info']['Tipo']} - {Tipo_Columna}",
-                fontsize=10, pad=15
+        Columnas = list(dict.fromkeys(
+            Columna for Indice in Indices_Presentes
+            for Columna in Definicion_Indices[Indice]['Columnas']
+        ))
+        Posicion = {Columna: i for i, Columna in enumerate(Columnas)}
+
+        # Una sola conversión a float para todas las columnas.
+        Originales = Dataframe[Columnas].apply(
+            pd.to_numeric, errors='coerce'
+        ).to_numpy(dtype=float, na_value=np.nan)
+        Matriz = Originales.copy()
+
+        # Invertir sobre la matriz y anotar las columnas de destino.
+        Invertidas = {}
+        for Indice in Indices_Presentes:
+            Definicion = Definicion_Indices[Indice]
+            Invertir = Definicion.get('Invertir', {})
+            if not Invertir:
+                continue
+            Minimo, Maximo = Definicion['Escala']
+            Posiciones = [Posicion[Columna] for Columna in Invertir]
+            Matriz[:, Posiciones] = (Minimo + Maximo) - Originales[:, Posiciones]
+            for Origen, Destino in Invertir.items():
+                Invertidas[Destino] = Posicion[Origen]
+
+        Nuevas = {}
+        Resultados_Fiabilidad = []
+        for Indice in Indices_Presentes:
+            Definicion = Definicion_Indices[Indice]
+            Bloque = Matriz[:, [Posicion[Columna]
+                                for Columna in Definicion['Columnas']]]
+
+            if Definicion['Agregacion'] == 'Suma':
+                Nuevas[Indice] = Bloque.sum(axis=1)
+            else:
+                Validos = ~np.isnan(Bloque)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    Nuevas[Indice] = (
+                        np.where(Validos, Bloque, 0).sum(axis=1) /
+                        Validos.sum(axis=1)
+                    )
+
+            if Calcular_Fiabilidad and 'Escala' in Definicion:
+                Items_Indice = [
+                    Definicion['Invertir'].get(Columna, Columna)
+                    for Columna in Definicion['Columnas']
+                ]
+                Estadisticas = Calcular_Fiabilidad_Escala(Bloque, Items_Indice)
+                Estadisticas.insert(0, 'Indice', Indice)
+                Resultados_Fiabilidad.append(Estadisticas)
+
+        # Columnas a escribir: las convertidas, las invertidas (que
+        # reemplazan a su origen si el destino es la misma columna) y
+        # los índices.
+        Salida = {
+            Columna: Originales[:, i] for Columna, i in Posicion.items()
+        }
+        Salida.update({
+            Destino: Matriz[:, i] for Destino, i in Invertidas.items()
+        })
+        Salida.update(Nuevas)
+        Salida = pd.DataFrame(Salida, index=Dataframe.index)
+
+        Existentes = [
+            Columna for Columna in Salida.columns
+            if Columna in Dataframe.columns
+        ]
+        Dataframe[Existentes] = Salida[Existentes]
+        Diccionario_Dataframes[Nombre_Df] = pd.concat(
+            [Dataframe, Salida.drop(columns=Existentes)], axis=1
+        )
+
+        if Resultados_Fiabilidad:
+            Fiabilidad[Nombre_Df] = pd.concat(
+                Resultados_Fiabilidad, ignore_index=True
             )
-            YLabel = 'Valor'
-            if 'Tiempo' in Tipo_Columna:
-                YLabel = 'Tiempo de Respuesta'
-            elif 'CO_' in Tipo_Columna:
-                YLabel = 'Cambio de Opinión'
-            Grafico.set_ylabel(YLabel, fontsize=9)
 
-            # Aplicar límites verticales si corresponde.
-            if 'CO_' in Tipo_Columna:
-                Grafico.set_ylim(-2, 2)
-            elif 'IP_Respuesta' in Tipo_Columna:
-                Grafico.set_ylim(1, 5)
+    if Calcular_Fiabilidad:
+        return Diccionario_Dataframes, Fiabilidad
 
-    for j in range(Num_Items, len(Graficos_Aplanados)):
-        Graficos_Aplanados[j].set_visible(False)
+    return Diccionario_Dataframes
 
-    plt.tight_layout()
-    plt.subplots_adjust(hspace=0.6, wspace=0.3)
+def Normalizar_Texto_Recodificacion(Valor: Any) -> Any:
 
-    Nombre_Base = (
-        f"Boxplots/Boxplots_Items_{Nombre_Df}_"
-        f"{Tipo_Columna}_Por_Categoria_PASO"
-    )
+    """
+    
+    Normaliza un valor de texto para buscarlo en una tabla de
+    recodificación: quita espacios en los extremos, pasa a minúsculas y
+    quita tildes y diacríticos. Los valores que no son texto se
+    devuelven sin cambios.
 
-    Figura.savefig(
-        f"{Nombre_Base}.png", format='png',
-        bbox_inches='tight', dpi=300
-    )
-    Figura.savefig(
-        f"{Nombre_Base}.svg", format='svg',
-        bbox_inches='tight', dpi=300
+    Parámetros:
+    - Valor: valor a normalizar.
+
+    Retorna:
+    - El valor normalizado.
+
+    """
+
+    if not isinstance(Valor, str):
+        return Valor
+
+    Descompuesto = unicodedata.normalize('NFKD', Valor.strip().lower())
+    return ''.join(
+        Caracter for Caracter in Descompuesto
+        if not unicodedata.combining(Caracter)
     )
 
-def Obtener_Nombre_Archivo() -> str:
+def Compilar_Recodificaciones(
+    Recodificaciones: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
 
-   """
-   Obtiene automáticamente el nombre del archivo notebook actual.
-   
-   Intenta varios métodos para determinar el nombre del notebook
-   de Jupyter en ejecución. Si no puede determinarlo automáticamente,
-   solicita al usuario que lo introduzca manualmente.
+    """
+    
+    Compila las definiciones de recodificación en tablas de búsqueda
+    con las claves ya normalizadas. Cada definición tiene 'Origen'
+    (columna de origen) y, o bien 'Mapeo' (diccionario valor →
+    etiqueta) y 'Defecto' (etiqueta de los valores sin mapear), o bien
+    'Rangos' y 'Etiquetas' (intervalos cerrados a la derecha, como
+    pd.cut). 'Numerico': True convierte antes la columna de origen a
+    numérico.
+
+    Parámetros:
+    - Recodificaciones: diccionario {columna destino: definición}.
+
+    Retorna:
+    - Diccionario {columna destino: tabla compilada}.
+
+    """
+
+    Tablas = {}
+
+    for Destino, Definicion in Recodificaciones.items():
+        Tabla = {
+            'Origen': Definicion['Origen'],
+            'Numerico': Definicion.get('Numerico', False)
+        }
+
+        if 'Rangos' in Definicion:
+            Tabla['Rangos'] = list(Definicion['Rangos'])
+            Tabla['Etiquetas'] = list(Definicion['Etiquetas'])
+        else:
+            Mapeo = {}
+            for Clave, Etiqueta in Definicion['Mapeo'].items():
+                Clave_Normalizada = Normalizar_Texto_Recodificacion(Clave)
+                if Mapeo.get(Clave_Normalizada, Etiqueta) != Etiqueta:
+                    raise ValueError(
+                        f"{Destino}: '{Clave}' se normaliza a "
+                        f"'{Clave_Normalizada}', que ya está mapeada a "
+                        f"'{Mapeo[Clave_Normalizada]}'."
+                    )
+                Mapeo[Clave_Normalizada] = Etiqueta
+            Tabla['Mapeo'] = Mapeo
+            Tabla['Defecto'] = Definicion['Defecto']
+
+        Tablas[Destino] = Tabla
+
+    return Tablas
+
+def Recodificar_Variables(
+    Diccionario_Dataframes: Dict[str, pd.DataFrame],
+    Tablas: Dict[str, Dict[str, Any]]
+):
+
+    """
+    
+    Aplica las tablas de Compilar_Recodificaciones a cada DataFrame.
+    Cada columna de origen se factoriza una sola vez, la normalización
+    y la búsqueda se hacen sobre los valores únicos y el resultado se
+    arma indexando con los códigos, de modo que el costo depende de la
+    cantidad de valores únicos y no de filas.
+
+    Parámetros:
+    - Diccionario_Dataframes: diccionario {nombre: DataFrame}.
+    - Tablas: tablas compiladas {columna destino: tabla}.
+
+    Retorna:
+    - Tupla (diccionario con los DataFrames recodificados,
+      {nombre: DataFrame de cobertura}), donde la cobertura lista, por
+      columna destino, los valores de origen sin mapear y sus casos.
+
+    """
+
+    Cobertura = {}
+
+    for Nombre_Df, Dataframe in Diccionario_Dataframes.items():
+
+        Nuevas = {}
+        Sin_Mapear = []
+
+        for Destino, Tabla in Tablas.items():
+            Origen = Tabla['Origen']
+            if Origen not in Dataframe.columns:
+                continue
+
+            if Tabla['Numerico']:
+                Dataframe[Origen] = pd.to_numeric(
+                    Dataframe[Origen], errors='coerce'
+                )
+
+            Codigos, Unicos = pd.factorize(Dataframe[Origen])
+
+            if 'Rangos' in Tabla:
+                Codigos_Rango = pd.cut(
+                    Unicos, bins=Tabla['Rangos'],
+                    labels=Tabla['Etiquetas'], right=True
+                ).codes
+                Codigos_Rango = np.append(Codigos_Rango, -1)
+                Resultado = pd.Series(
+                    pd.Categorical.from_codes(
+                        Codigos_Rango[Codigos],
+                        categories=Tabla['Etiquetas'], ordered=True
+                    ),
+                    index=Dataframe.index
+                )
+            else:
+                Normalizados = [
+                    Normalizar_Texto_Recodificacion(Valor) for Valor in Unicos
+                ]
+
+                # El último lugar corresponde a los faltantes (código -1).
+                Etiquetas = np.array(
+                    [Tabla['Mapeo'].get(Valor, Tabla['Defecto'])
+                     for Valor in Normalizados] + [Tabla['Defecto']],
+                    dtype=object
+                )
+                Resultado = pd.Series(
+                    Etiquetas[Codigos], index=Dataframe.index
+                )
+
+                # Casos por valor único (el primero son los faltantes).
+                Casos = np.bincount(Codigos + 1, minlength=len(Unicos) + 1)
+                for Posicion, Valor in enumerate(Unicos):
+                    if Normalizados[Posicion] not in Tabla['Mapeo']:
+                        Sin_Mapear.append((Destino, Origen, Valor,
+                                           Casos[Posicion + 1]))
+                if Casos[0]:
+                    Sin_Mapear.append((Destino, Origen, np.nan, Casos[0]))
+
+            if Destino in Dataframe.columns:
+                Dataframe[Destino] = Resultado
+            else:
+                Nuevas[Destino] = Resultado
+
+        if Nuevas:
+            Dataframe = pd.concat([Dataframe, pd.DataFrame(Nuevas)], axis=1)
+        Diccionario_Dataframes[Nombre_Df] = Dataframe
+
+        Cobertura[Nombre_Df] = pd.DataFrame(
+            Sin_Mapear, columns=['Columna', 'Origen', 'Valor', 'Casos']
+        )
+
+    return Diccionario_Dataframes, Cobertura
+
+def Limpiar_Texto(texto):
    
-   Returns:
-       str: El nombre del notebook sin la extensión .ipynb
+   """
+   Limpia el texto removiendo guiones bajos y capitalizando solo la primera letra.
    
    """
 
-   import os
-   import json
-   import ipykernel
-
-   try:
-       # Obtiene el archivo de conexión del kernel actual.
-       Archivo_Conexion: str = ipykernel.get_connection_file()
-       
-       # Extrae el ID del kernel del nombre del archivo de conexión.
-       Kernel_Id: str = (os.path.basename(Archivo_Conexion)
-                        .split('-')[1]
-                        .split('.')[0])
-       
-       # Busca el nombre en las variables de entorno de Jupyter.
-       Nombre_Notebook: str = os.environ.get('JPY_SESSION_NAME', 
-                                            'Desconocido')
-       
-       if Nombre_Notebook == 'Desconocido':
-           # Intenta obtener desde el directorio de trabajo actual.
-           Ruta_Trabajo: str = os.getcwd()
-           Archivos_Notebook: list[str] = [archivo for archivo in 
-                                         os.listdir(Ruta_Trabajo) 
-                                         if archivo.endswith('.ipynb')]
-           
-           if Archivos_Notebook:
-               # Toma el primer notebook encontrado en el directorio.
-               Nombre_Notebook = Archivos_Notebook[0]
-           else:
-               Nombre_Notebook = "notebook_actual"
-       
-       return os.path.splitext(Nombre_Notebook)[0]
-       
-   except Exception as Error:
-       print("No se pudo determinar automáticamente el nombre.")
-       print(f"Error: {Error}")
-       # Solicita al usuario que introduzca el nombre manualmente.
-       Nombre_Notebook_Input: str = input("Introduce el nombre del notebook: ")
-       return os.path.splitext(Nombre_Notebook_Input)[0]
+   return texto.replace('_', ' ').capitalize()
+
+def Obtener_Columnas_Boxplot(
+    Data_Frame: pd.DataFrame,
+    Diccionario_Items: dict[int, dict[str, Any]],
+    Tipo_Columna: str
+) -> dict[int, dict[str, Any]]:
+
+    """
+    
+    Obtiene, para cada ítem, la columna de Data_Frame que corresponde
+    al tipo de columna indicado (ver Crear_Boxplots_Items).
+
+    Retorna:
+    - Diccionario {número de ítem: {'Info': metadata, 'Columna': nombre}}
+      con los ítems cuya columna existe.
+
+    """
+
+    # 'CO_Pro_Izq' y 'CO_Con_Izq' usan la misma plantilla ('CO_Izq'): el
+    # tipo solo indica qué ítems trae Diccionario_Items.
+    Plantilla = Plantillas_Columnas.get(
+        re.sub(r'_(Pro|Con)_', '_', Tipo_Columna)
+    )
+    if Plantilla is None:
+        return {}
+
+    Columnas_Presentes = set(Data_Frame.columns)
+    Items_Disponibles: dict[int, dict[str, Any]] = {}
+    for Numero_Item, Info_Item in Diccionario_Items.items():
+        Nombre_Columna = Plantilla.format(Numero_Item)
+        if Nombre_Columna in Columnas_Presentes:
+            Items_Disponibles[Numero_Item] = {
+                'Info': Info_Item,
+                'Columna': Nombre_Columna
+            }
+
+    return Items_Disponibles
+
+def Calcular_Hash_Boxplot(
+    Data_Frame: pd.DataFrame,
+    Items_Disponibles: dict[int, dict[str, Any]],
+    Tipo_Columna: str,
+    Nombre_Df: str
+) -> str:
+
+    """
+    
+    Calcula un hash del contenido de las columnas que se grafican
+    (más 'Categoria_PASO_2023') y de los parámetros del gráfico.
+
+    """
+
+    import hashlib
+
+    Columnas = [
+        Item_Data['Columna'] for Item_Data in Items_Disponibles.values()
+    ] + ['Categoria_PASO_2023']
+
+    Hash = hashlib.sha256()
+    Hash.update(
+        pd.util.hash_pandas_object(
+            Data_Frame[Columnas], index=False
+        ).to_numpy().tobytes()
+    )
+    Hash.update(json.dumps(
+        [Columnas, Tipo_Columna, Nombre_Df,
+         {str(Numero): Item_Data['Info']
+          for Numero, Item_Data in Items_Disponibles.items()}],
+        sort_keys=True, default=str
+    ).encode('utf-8'))
+
+    return Hash.hexdigest()
+
+def Boxplot_En_Cache(Nombre_Base: str, Hash_Datos: str) -> bool:
+
+    """
+    
+    Indica si los archivos PNG y SVG de Nombre_Base existen y fueron
+    generados con los mismos datos y parámetros (mismo hash).
+
+    """
+
+    import os
+
+    Archivo_Hash = f"{Nombre_Base}.hash"
+    if not all(os.path.exists(Archivo) for Archivo in [
+        f"{Nombre_Base}.png", f"{Nombre_Base}.svg", Archivo_Hash
+    ]):
+        return False
+
+    with open(Archivo_Hash, encoding='utf-8') as Archivo:
+        return Archivo.read().strip() == Hash_Datos
+
+def Crear_Boxplots_Items(
+    Data_Frame: pd.DataFrame,
+    Diccionario_Items: dict[int, dict[str, Any]],
+    Tipo_Columna: str = 'IP_Respuesta',
+    Nombre_Df: str = 'df',
+    Carpeta: str = 'Boxplots',
+    Usar_Cache: bool = True
+) -> bool:
+
+    """
+    
+    Crea boxplots para cada ítem segmentado por categoría PASO 2023,
+    incluyendo IP, CO y CT. Guarda cada gráfico en formatos PNG y SVG
+    en la carpeta 'Boxplots/'. Aplica límites verticales según tipo de
+    columna y usa colores específicos por categoría.
+
+    Parámetros:
+    - Data_Frame: DataFrame sobre el que graficar.
+    - Diccionario_Items: metadata de cada ítem (número, título, tipo).
+    - Tipo_Columna: uno de:
+        'IP_Respuesta',
+        'IP_Izq_Respuesta','IP_Der_Respuesta',
+        'IP_Tiempo','IP_Izq_Tiempo','IP_Der_Tiempo',
+        'CO_Pro_Izq','CO_Con_Izq','CO_Pro_Der','CO_Con_Der',
+        'CT_Pro_Izq','CT_Con_Izq','CT_Pro_Der','CT_Con_Der'
+    - Nombre_Df: nombre para los archivos de salida.
+    - Carpeta: carpeta de salida (por defecto 'Boxplots').
+    - Usar_Cache: si es True, no vuelve a graficar cuando los archivos
+      existentes se generaron con los mismos datos y parámetros.
+
+    Retorna:
+    - True si se generó el gráfico, False si no había columnas o si se
+      reutilizaron los archivos existentes.
+
+    """
+
+    import os
+    import numpy as np
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
+    # Crear carpeta si no existe.
+    os.makedirs(Carpeta, exist_ok=True)
+
+    Mapa_Colores_Categorias = {
+        'Progressivism': '#0078bf',
+        'Moderate_Right_A': '#f7d117',
+        'Moderate_Right_B': '#f7d117',
+        'Left_Wing': '#f65058',
+        'Blank': '#FFFFFF',
+        'Centre': '#009cdd',
+        'Right_Wing_Libertarian': '#753bbd'
+    }
+
+    Items_Disponibles = Obtener_Columnas_Boxplot(
+        Data_Frame, Diccionario_Items, Tipo_Columna
+    )
+
+    if not Items_Disponibles:
+        print(f"No hay columnas del tipo {Tipo_Columna}")
+        return False
+
+    Nombre_Base = (
+        f"{Carpeta}/Boxplots_Items_{Nombre_Df}_"
+        f"{Tipo_Columna}_Por_Categoria_PASO"
+    )
+
+    # Reutilizar los archivos si los datos y parámetros no cambiaron.
+    Hash_Datos = Calcular_Hash_Boxplot(
+        Data_Frame, Items_Disponibles, Tipo_Columna, Nombre_Df
+    )
+    if Usar_Cache and Boxplot_En_Cache(Nombre_Base, Hash_Datos):
+        return False
+
+    Num_Items = len(Items_Disponibles)
+    Filas = int(np.ceil(Num_Items / 3))
+    Columnas = min(3, Num_Items)
+
+    Figura, Graficos = plt.subplots(
+        Filas, Columnas,
+        figsize=(50, 5 * Filas)
+    )
+
+    Graficos_Aplanados = np.array(Graficos).flatten()
+
+    for IDX, (Num_Item, Item_Data) in enumerate(
+        Items_Disponibles.items()
+    ):
+        Grafico = Graficos_Aplanados[IDX]
+        Columna = Item_Data['Columna']
+
+        Datos = Data_Frame.dropna(
+            subset=[Columna, 'Categoria_PASO_2023']
+        )
+        Datos = Datos[~Datos['Categoria_PASO_2023'].
+            isin(['No apply','No response','Other'])]
+
+        if Datos.empty:
+            Grafico.text(
+                0.5, 0.5, 'Sin datos válidos',
+                ha='center', va='center',
+                transform=Grafico.transAxes
+            )
+        else:
+            Paleta_Colores = [
+                Mapa_Colores_Categorias.get(cat, '#999999')
+                for cat in Orden_Categorias
+            ]
+            sns.boxplot(
+                data=Datos,
+                x='Categoria_PASO_2023',
+                y=Columna,
+                order=Orden_Categorias,
+                palette=Paleta_Colores,
+                ax=Grafico
+            )
+            Etiquetas_Categorias = []
+            for Categoria in Orden_Categorias:
+                Subdatos = Datos[Datos['Categoria_PASO_2023'] == Categoria][Columna]
+                if not Subdatos.empty:
+                    Media = Subdatos.mean()
+                    if abs(Media) < 1:
+                        Etiqueta = f"{Categoria.replace('_', ' ')}\n({Media:.3f})"
+                    else:
+                        Etiqueta = f"{Categoria.replace('_', ' ')}\n({Media:.2f})"
+                else:
+                    Etiqueta = Categoria.replace('_', ' ') + "\n(N/A)"
+                Etiquetas_Categorias.append(Etiqueta)
+
+            Grafico.set_xticklabels(Etiquetas_Categorias, rotation=45, ha='right')
+            Grafico.set_title(
+                f"Item {Item_Data['Info']['Numero_Item']}: "
+                f"{Item_Data['Info']['Titulo']}\n"
+                f"{Item_Data['Info']['Tipo']} - {Tipo_Columna}",
+                fontsize=10, pad=15
+            )
+            YLabel = 'Valor'
+            if 'Tiempo' in Tipo_Columna:
+                YLabel = 'Tiempo de Respuesta'
+            elif 'CO_' in Tipo_Columna:
+                YLabel = 'Cambio de Opinión'
+            Grafico.set_ylabel(YLabel, fontsize=9)
+
+            # Aplicar límites verticales si corresponde.
+            if 'CO_' in Tipo_Columna:
+                Grafico.set_ylim(-2, 2)
+            elif 'IP_Respuesta' in Tipo_Columna:
+                Grafico.set_ylim(1, 5)
+
+    for j in range(Num_Items, len(Graficos_Aplanados)):
+        Graficos_Aplanados[j].set_visible(False)
+
+    plt.tight_layout()
+    plt.subplots_adjust(hspace=0.6, wspace=0.3)
+
+    Figura.savefig(
+        f"{Nombre_Base}.png", format='png',
+        bbox_inches='tight', dpi=300
+    )
+    Figura.savefig(
+        f"{Nombre_Base}.svg", format='svg',
+        bbox_inches='tight', dpi=300
+    )
+
+    # Cerrar la figura para liberar memoria.
+    plt.close(Figura)
+
+    with open(f"{Nombre_Base}.hash", 'w', encoding='utf-8') as Archivo:
+        Archivo.write(Hash_Datos)
+
+    return True
+
+def Renderizar_Boxplots_Tarea(Tarea: dict[str, Any]) -> bool:
+
+    """
+    
+    Ejecuta Crear_Boxplots_Items con los argumentos de Tarea usando el
+    backend no interactivo 'Agg'. Se usa desde los procesos de
+    Crear_Boxplots_En_Paralelo.
+
+    """
+
+    plt.switch_backend('Agg')
+
+    return Crear_Boxplots_Items(**Tarea)
+
+def Crear_Boxplots_En_Paralelo(
+    Tareas: List[dict[str, Any]],
+    Numero_Procesos: int = None,
+    Carpeta: str = 'Boxplots',
+    Usar_Cache: bool = True
+) -> pd.DataFrame:
+
+    """
+    
+    Genera varios gráficos de Crear_Boxplots_Items en paralelo, uno por
+    proceso, sin volver a graficar los que no cambiaron.
+
+    Parámetros:
+    - Tareas: lista de diccionarios con las claves 'Data_Frame',
+      'Diccionario_Items', 'Tipo_Columna' y 'Nombre_Df'.
+    - Numero_Procesos: cantidad de procesos (por defecto, uno por núcleo).
+    - Carpeta: carpeta de salida.
+    - Usar_Cache: si es True, omite los gráficos cuyo hash coincide con
+      el de los archivos existentes.
+
+    Retorna:
+    - DataFrame con 'Nombre_Df', 'Tipo_Columna' y 'Estado' ('Generado',
+      'En_Cache', 'Sin_Columnas' o 'Error: ...') de cada tarea.
+
+    """
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    Resultados = []
+    Pendientes = []
+
+    for Tarea in Tareas:
+        Items_Disponibles = Obtener_Columnas_Boxplot(
+            Tarea['Data_Frame'], Tarea['Diccionario_Items'],
+            Tarea['Tipo_Columna']
+        )
+        Resultado = {
+            'Nombre_Df': Tarea['Nombre_Df'],
+            'Tipo_Columna': Tarea['Tipo_Columna'],
+            'Estado': None
+        }
+        Resultados.append(Resultado)
+
+        if not Items_Disponibles:
+            Resultado['Estado'] = 'Sin_Columnas'
+            continue
+
+        # Enviar a cada proceso solo las columnas que se grafican.
+        Columnas = [
+            Item_Data['Columna']
+            for Item_Data in Items_Disponibles.values()
+        ] + ['Categoria_PASO_2023']
+        Data_Frame = Tarea['Data_Frame'][Columnas]
+
+        Nombre_Base = (
+            f"{Carpeta}/Boxplots_Items_{Tarea['Nombre_Df']}_"
+            f"{Tarea['Tipo_Columna']}_Por_Categoria_PASO"
+        )
+        if Usar_Cache and Boxplot_En_Cache(
+            Nombre_Base,
+            Calcular_Hash_Boxplot(
+                Data_Frame, Items_Disponibles,
+                Tarea['Tipo_Columna'], Tarea['Nombre_Df']
+            )
+        ):
+            Resultado['Estado'] = 'En_Cache'
+            continue
+
+        Pendientes.append((Resultado, {
+            'Data_Frame': Data_Frame,
+            'Diccionario_Items': Tarea['Diccionario_Items'],
+            'Tipo_Columna': Tarea['Tipo_Columna'],
+            'Nombre_Df': Tarea['Nombre_Df'],
+            'Carpeta': Carpeta,
+            'Usar_Cache': False
+        }))
+
+    if Pendientes:
+        with ProcessPoolExecutor(max_workers=Numero_Procesos) as Ejecutor:
+            Futuros = [
+                (Resultado, Ejecutor.submit(Renderizar_Boxplots_Tarea, Tarea))
+                for Resultado, Tarea in Pendientes
+            ]
+            for Resultado, Futuro in Futuros:
+                try:
+                    Futuro.result()
+                    Resultado['Estado'] = 'Generado'
+                except Exception as Error:
+                    Resultado['Estado'] = f'Error: {Error}'
+
+    return pd.DataFrame(Resultados)
+
+
+def Ajustar_Valores_P(
+    Valores_P: np.ndarray,
+    Metodo: str = 'holm'
+) -> np.ndarray:
+
+    """
+    
+    Ajusta valores p por comparaciones múltiples a lo largo del último
+    eje, de modo que cada fila de una matriz es una familia distinta.
+    Los NaN se ignoran y no cuentan en el tamaño de la familia.
+
+    Parámetros:
+    - Valores_P: arreglo de valores p (1D o 2D).
+    - Metodo: 'holm', 'fdr_bh' (Benjamini-Hochberg), 'bonferroni'
+      o None para no ajustar.
+
+    Retorna:
+    - Arreglo con la misma forma que Valores_P con los valores ajustados.
+
+    """
+
+    Valores_P = np.asarray(Valores_P, dtype=float)
+    if Metodo is None:
+        return Valores_P.copy()
+
+    Matriz = np.atleast_2d(Valores_P)
+    Faltantes = np.isnan(Matriz)
+    Cantidad = (~Faltantes).sum(axis=-1, keepdims=True)
+
+    # Los NaN quedan al final de cada fila al ordenar.
+    Orden = np.argsort(Matriz, axis=-1)
+    Ordenados = np.take_along_axis(Matriz, Orden, axis=-1)
+    Posicion = np.arange(Matriz.shape[-1])
+
+    if Metodo == 'holm':
+        Ajustados = np.maximum.accumulate(
+            (Cantidad - Posicion) * Ordenados, axis=-1
+        )
+    elif Metodo == 'fdr_bh':
+        Ajustados = np.fmin.accumulate(
+            (Ordenados * Cantidad / (Posicion + 1))[..., ::-1], axis=-1
+        )[..., ::-1]
+    elif Metodo == 'bonferroni':
+        Ajustados = Ordenados * Cantidad
+    else:
+        raise ValueError(
+            f"Método de ajuste desconocido: {Metodo}. "
+            "Usar 'holm', 'fdr_bh', 'bonferroni' o None."
+        )
+
+    Ajustados = np.minimum(Ajustados, 1)
+    Ajustados[np.isnan(Ordenados)] = np.nan
+    Resultado = np.empty_like(Matriz)
+    np.put_along_axis(Resultado, Orden, Ajustados, axis=-1)
+
+    return Resultado.reshape(Valores_P.shape)
+
+def Calcular_Rangos_Por_Categoria(
+    Data_Frame: pd.DataFrame,
+    Columnas: List[str],
+    Columna_Categoria: str = 'Categoria_PASO_2023',
+    Categorias: List[str] = None,
+    Eliminacion_Conjunta: bool = False
+) -> Dict[str, Any]:
+
+    """
+    
+    Rankea todas las columnas de una sola vez y acumula, por categoría,
+    las sumas de rangos y los tamaños de grupo que necesitan las pruebas
+    de Kruskal-Wallis y de Dunn. Cada columna se rankea solo con sus
+    valores no nulos.
+
+    Parámetros:
+    - Data_Frame: DataFrame con los datos.
+    - Columnas: columnas numéricas a comparar.
+    - Columna_Categoria: columna que define los grupos.
+    - Categorias: categorías a incluir, en el orden deseado. Si es None,
+      se usan todas las presentes, ordenadas alfabéticamente.
+    - Eliminacion_Conjunta: si es True, descarta las filas con algún
+      nulo en Columnas (como dropna(subset=Columnas)); si es False,
+      cada columna usa sus propios valores no nulos.
+
+    Retorna:
+    - Diccionario con 'Columnas', 'Categorias', 'Sumas_Rangos' y
+      'Conteos' (matrices categorías x columnas), 'N' y 'Suma_Empates'
+      (suma de t^3 - t de cada columna).
+
+    """
+
+    Datos = Data_Frame[Data_Frame[Columna_Categoria].notna()]
+    if Categorias is None:
+        Categorias = sorted(Datos[Columna_Categoria].unique())
+    Datos = Datos[Datos[Columna_Categoria].isin(Categorias)]
+
+    Valores = Datos[Columnas].apply(pd.to_numeric, errors='coerce')
+    if Eliminacion_Conjunta:
+        Valores = Valores.dropna()
+        Datos = Datos.loc[Valores.index]
+
+    Codigos = pd.Categorical(
+        Datos[Columna_Categoria], categories=Categorias
+    ).codes
+    Indicadora = np.zeros((len(Datos), len(Categorias)))
+    Indicadora[np.arange(len(Datos)), Codigos] = 1
+
+    Rangos = Valores.rank(method='average').to_numpy(dtype=float)
+    # Cada valor empatado t veces aporta t^2 - 1, y un grupo de t
+    # empates suma t^3 - t.
+    Tamanos_Empate = (
+        Valores.rank(method='max') - Valores.rank(method='min') + 1
+    ).to_numpy(dtype=float)
+    Presentes = Valores.notna().to_numpy(dtype=float)
+
+    return {
+        'Columnas': list(Columnas),
+        'Categorias': list(Categorias),
+        'Sumas_Rangos': Indicadora.T @ np.nan_to_num(Rangos),
+        'Conteos': Indicadora.T @ Presentes,
+        'N': Presentes.sum(axis=0),
+        'Suma_Empates': np.nansum(Tamanos_Empate ** 2 - 1, axis=0)
+    }
+
+def Prueba_Kruskal_Wallis_Lote(
+    Data_Frame: pd.DataFrame,
+    Columnas: List[str],
+    Columna_Categoria: str = 'Categoria_PASO_2023',
+    Categorias: List[str] = None,
+    Eliminacion_Conjunta: bool = False,
+    Minimo_Por_Grupo: int = 1,
+    Metodo_Ajuste: str = 'holm',
+    Rangos: Dict[str, Any] = None
+) -> pd.DataFrame:
+
+    """
+    
+    Aplica Kruskal-Wallis (con corrección por empates) a todas las
+    columnas a la vez. Equivale a llamar a scipy.stats.kruskal con un
+    grupo por categoría para cada columna.
+
+    Parámetros:
+    - Data_Frame, Columnas, Columna_Categoria, Categorias,
+      Eliminacion_Conjunta: ver Calcular_Rangos_Por_Categoria.
+    - Minimo_Por_Grupo: tamaño mínimo que debe tener cada categoría para
+      que la columna se evalúe.
+    - Metodo_Ajuste: ajuste de los valores p entre columnas
+      (ver Ajustar_Valores_P).
+    - Rangos: resultado de Calcular_Rangos_Por_Categoria para reutilizar.
+
+    Retorna:
+    - DataFrame con 'Variable', 'Estadistico_Kruskal', 'Valor_p',
+      'Valor_p_Ajustado', 'Grados_Libertad' y 'N', ordenado por
+      'Valor_p'. Se omiten las columnas sin variabilidad o con alguna
+      categoría por debajo de Minimo_Por_Grupo.
+
+    """
+
+    from scipy.stats import chi2
+
+    if Rangos is None:
+        Rangos = Calcular_Rangos_Por_Categoria(
+            Data_Frame, Columnas, Columna_Categoria,
+            Categorias, Eliminacion_Conjunta
+        )
+    Sumas = Rangos['Sumas_Rangos']
+    Conteos = Rangos['Conteos']
+    N = Rangos['N']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Cuadrados = np.where(Conteos > 0, Sumas ** 2 / Conteos, 0)
+        H = 12 / (N * (N + 1)) * Cuadrados.sum(axis=0) - 3 * (N + 1)
+        Correccion = 1 - Rangos['Suma_Empates'] / (N ** 3 - N)
+        H = H / Correccion
+
+    Validas = (Conteos >= Minimo_Por_Grupo).all(axis=0) & (Correccion > 0)
+    Grados_Libertad = len(Rangos['Categorias']) - 1
+    Valores_P = np.where(Validas, chi2.sf(H, Grados_Libertad), np.nan)
+
+    Tabla = pd.DataFrame({
+        'Variable': Rangos['Columnas'],
+        'Estadistico_Kruskal': H,
+        'Valor_p': Valores_P,
+        'Valor_p_Ajustado': np.nan,
+        'Grados_Libertad': Grados_Libertad,
+        'N': N.astype(int)
+    })[Validas]
+    Tabla['Valor_p_Ajustado'] = Ajustar_Valores_P(
+        Tabla['Valor_p'].to_numpy(), Metodo_Ajuste
+    )
+
+    return Tabla.sort_values(by='Valor_p').reset_index(drop=True)
+
+def Prueba_Dunn_Lote(
+    Data_Frame: pd.DataFrame,
+    Columnas: List[str],
+    Columna_Categoria: str = 'Categoria_PASO_2023',
+    Categorias: List[str] = None,
+    Eliminacion_Conjunta: bool = False,
+    Metodo_Ajuste: str = 'holm',
+    Rangos: Dict[str, Any] = None
+) -> pd.DataFrame:
+
+    """
+    
+    Aplica la prueba post hoc de Dunn a todas las columnas y todos los
+    pares de categorías a la vez. Equivale a scikit_posthocs.posthoc_dunn
+    por columna, con el ajuste hecho dentro de cada columna.
+
+    Parámetros:
+    - Data_Frame, Columnas, Columna_Categoria, Categorias,
+      Eliminacion_Conjunta: ver Calcular_Rangos_Por_Categoria.
+    - Metodo_Ajuste: ajuste de los valores p entre los pares de cada
+      columna (ver Ajustar_Valores_P).
+    - Rangos: resultado de Calcular_Rangos_Por_Categoria para reutilizar.
+
+    Retorna:
+    - DataFrame con una fila por columna y par de categorías:
+      'Variable', 'Categoria_1', 'Categoria_2', 'N_1', 'N_2',
+      'Estadistico_Z', 'Valor_p' y 'Valor_p_Ajustado'. Se omiten los
+      pares con alguna categoría sin datos en esa columna.
+
+    """
+
+    from scipy.stats import norm
+
+    if Rangos is None:
+        Rangos = Calcular_Rangos_Por_Categoria(
+            Data_Frame, Columnas, Columna_Categoria,
+            Categorias, Eliminacion_Conjunta
+        )
+    Conteos = Rangos['Conteos']
+    N = Rangos['N']
+    Categorias = Rangos['Categorias']
+    Cantidad_Columnas = len(Rangos['Columnas'])
+
+    # Pares (i, j) con i < j: matrices pares x columnas.
+    Indices_1, Indices_2 = np.triu_indices(len(Categorias), 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Promedios = Rangos['Sumas_Rangos'] / Conteos
+        Varianza = (
+            N * (N + 1) / 12 - Rangos['Suma_Empates'] / (12 * (N - 1))
+        )
+        Z = (Promedios[Indices_1] - Promedios[Indices_2]) / np.sqrt(
+            Varianza * (1 / Conteos[Indices_1] + 1 / Conteos[Indices_2])
+        )
+    Validos = (Conteos[Indices_1] > 0) & (Conteos[Indices_2] > 0)
+    Z = np.where(Validos, Z, np.nan)
+    Valores_P = 2 * norm.sf(np.abs(Z))
+    Ajustados = Ajustar_Valores_P(Valores_P.T, Metodo_Ajuste).T
+
+    Cantidad_Pares = len(Indices_1)
+    Tabla = pd.DataFrame({
+        'Variable': np.repeat(Rangos['Columnas'], Cantidad_Pares),
+        'Categoria_1': np.tile(
+            np.asarray(Categorias, dtype=object)[Indices_1],
+            Cantidad_Columnas
+        ),
+        'Categoria_2': np.tile(
+            np.asarray(Categorias, dtype=object)[Indices_2],
+            Cantidad_Columnas
+        ),
+        'N_1': Conteos[Indices_1].T.ravel().astype(int),
+        'N_2': Conteos[Indices_2].T.ravel().astype(int),
+        'Estadistico_Z': Z.T.ravel(),
+        'Valor_p': Valores_P.T.ravel(),
+        'Valor_p_Ajustado': Ajustados.T.ravel()
+    })
+
+    return Tabla[Validos.T.ravel()].reset_index(drop=True)
+
+def Comparar_Categorias_Kruskal_Dunn(
+    Data_Frame: pd.DataFrame,
+    Columnas: List[str],
+    Columna_Categoria: str = 'Categoria_PASO_2023',
+    Categorias: List[str] = None,
+    Eliminacion_Conjunta: bool = False,
+    Minimo_Por_Grupo: int = 1,
+    Metodo_Ajuste: str = 'holm'
+) -> pd.DataFrame:
+
+    """
+    
+    Ejecuta Kruskal-Wallis y Dunn sobre todas las columnas con un único
+    rankeo y devuelve una sola tabla ordenada: una fila por columna y
+    par de categorías, con el resultado global de la columna repetido.
+
+    Parámetros:
+    - Ver Prueba_Kruskal_Wallis_Lote y Prueba_Dunn_Lote. Metodo_Ajuste
+      se aplica tanto entre columnas (Kruskal) como entre pares (Dunn).
+
+    Retorna:
+    - DataFrame con 'Variable', 'Estadistico_Kruskal', 'Valor_p_Kruskal',
+      'Valor_p_Kruskal_Ajustado', 'Grados_Libertad', 'N' y las columnas
+      de Prueba_Dunn_Lote. Solo incluye las columnas evaluadas por
+      Kruskal-Wallis.
+
+    """
+
+    Rangos = Calcular_Rangos_Por_Categoria(
+        Data_Frame, Columnas, Columna_Categoria,
+        Categorias, Eliminacion_Conjunta
+    )
+    Tabla_Kruskal = Prueba_Kruskal_Wallis_Lote(
+        Data_Frame, Columnas, Minimo_Por_Grupo=Minimo_Por_Grupo,
+        Metodo_Ajuste=Metodo_Ajuste, Rangos=Rangos
+    ).rename(columns={
+        'Valor_p': 'Valor_p_Kruskal',
+        'Valor_p_Ajustado': 'Valor_p_Kruskal_Ajustado'
+    })
+    Tabla_Dunn = Prueba_Dunn_Lote(
+        Data_Frame, Columnas, Metodo_Ajuste=Metodo_Ajuste, Rangos=Rangos
+    )
+
+    return Tabla_Kruskal.merge(Tabla_Dunn, on='Variable', how='inner')
+
+def Resumir_Comparaciones_Dunn(
+    Tabla_Dunn: pd.DataFrame,
+    Alfa: float = 0.05,
+    Columna_Valor_P: str = 'Valor_p_Ajustado'
+) -> List[str]:
+
+    """
+    
+    Arma un resumen interpretativo por variable con los pares de
+    categorías que difieren significativamente.
+
+    Parámetros:
+    - Tabla_Dunn: resultado de Prueba_Dunn_Lote.
+    - Alfa: umbral de significancia.
+    - Columna_Valor_P: columna de valores p a comparar con Alfa.
+
+    Retorna:
+    - Lista de textos, uno por variable, en el orden de la tabla.
+
+    """
+
+    Resumen_Significancias = []
+
+    for Nombre_Variable, Tabla_Variable in Tabla_Dunn.groupby(
+        'Variable', sort=False
+    ):
+        Significativas = Tabla_Variable[
+            Tabla_Variable[Columna_Valor_P] < Alfa
+        ]
+        Comparaciones_Significativas = [
+            f"- {Categoria_1} vs {Categoria_2} (p = {P_Valor:.4f})"
+            for Categoria_1, Categoria_2, P_Valor in zip(
+                Significativas['Categoria_1'],
+                Significativas['Categoria_2'],
+                Significativas[Columna_Valor_P]
+            )
+        ]
+
+        if Comparaciones_Significativas:
+            Resumen = (
+                f"\n📊 Comparaciones significativas para **{Nombre_Variable}**:\n" +
+                "\n".join(Comparaciones_Significativas)
+            )
+        else:
+            Resumen = (
+                f"\n📊 No se encontraron diferencias significativas "
+                f"entre categorías para **{Nombre_Variable}**."
+            )
+
+        Resumen_Significancias.append(Resumen)
+
+    return Resumen_Significancias
+
+
+def Remuestrear_Bloque(Tarea: dict[str, Any]) -> dict[str, np.ndarray]:
+
+    """
+    
+    Ejecuta un bloque de remuestreos para un grupo: medias bootstrap
+    (a partir de una matriz de índices remuestreados) y medias con
+    signos permutados al azar. Se usa desde Remuestrear_Medias_Por_Grupo.
+
+    Parámetros:
+    - Tarea: diccionario con 'Valores' (filas x columnas, NaN en 0),
+      'Presentes' (1 donde hay dato), 'Observadas' (media de cada
+      columna), 'Cantidad' (remuestreos del bloque) y 'Semilla'
+      (entropía y spawn_key de la SeedSequence del bloque).
+
+    Retorna:
+    - Diccionario con 'Medias' (remuestreos x columnas) y 'Excesos'
+      (cantidad de permutaciones con |media| >= |media observada|).
+
+    """
+
+    Entropia, Clave = Tarea['Semilla']
+    Generador = np.random.default_rng(
+        np.random.SeedSequence(Entropia, spawn_key=Clave)
+    )
+    Valores = Tarea['Valores']
+    Presentes = Tarea['Presentes']
+    Cantidad = Tarea['Cantidad']
+    Filas = Valores.shape[0]
+
+    # Bootstrap: matriz de índices remuestreados convertida en cuántas
+    # veces entra cada fila en cada remuestreo.
+    Indices = Generador.integers(0, Filas, size=(Cantidad, Filas))
+    Pesos = np.bincount(
+        (np.arange(Cantidad)[:, None] * Filas + Indices).ravel(),
+        minlength=Cantidad * Filas
+    ).reshape(Cantidad, Filas).astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Medias = (Pesos @ Valores) / (Pesos @ Presentes)
+
+    # Permutación: bajo H0 (media 0) el signo de cada fila es arbitrario.
+    Signos = Generador.integers(0, 2, size=(Cantidad, Filas)) * 2.0 - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Medias_Permutadas = (Signos @ Valores) / Presentes.sum(axis=0)
+    Excesos = (
+        np.abs(Medias_Permutadas) >=
+        np.abs(Tarea['Observadas']) * (1 - 1e-12)
+    ).sum(axis=0)
+
+    return {'Medias': Medias, 'Excesos': Excesos}
+
+def Remuestrear_Medias_Por_Grupo(
+    Data_Frame: pd.DataFrame,
+    Columnas: List[str],
+    Columna_Categoria: str = 'Categoria_PASO_2023',
+    Categorias: List[str] = None,
+    Numero_Remuestras: int = 10000,
+    Nivel_Confianza: float = 0.95,
+    Semilla: int = 0,
+    Tamano_Bloque: int = 1000,
+    Numero_Procesos: int = 1,
+    Carpeta_Progreso: str = None
+) -> pd.DataFrame:
+
+    """
+    
+    Calcula, para cada columna y categoría, un intervalo de confianza
+    bootstrap (percentil) de la media y un valor p de permutación por
+    cambio de signo para H0: media = 0. Está pensado para columnas de
+    diferencias (Der - Izq, DifDif). Los remuestreos se generan por
+    bloques como matrices de pesos, de modo que cada bloque resuelve
+    todas las columnas con dos productos de matrices. Las columnas con
+    faltantes se remuestrean por filas del grupo y promedian solo sus
+    valores presentes.
+
+    Cada bloque tiene su propia semilla derivada de (Semilla, grupo,
+    bloque): el resultado es el mismo con cualquier Numero_Procesos y
+    al retomar una corrida interrumpida.
+
+    Parámetros:
+    - Data_Frame: DataFrame con los datos.
+    - Columnas: columnas numéricas a remuestrear.
+    - Columna_Categoria: columna que define los grupos.
+    - Categorias: categorías a incluir (por defecto, todas las
+      presentes, ordenadas alfabéticamente).
+    - Numero_Remuestras: remuestreos bootstrap y permutaciones.
+    - Nivel_Confianza: nivel del intervalo (por defecto 0.95).
+    - Semilla: semilla base.
+    - Tamano_Bloque: remuestreos por bloque (cada bloque es una tarea).
+    - Numero_Procesos: procesos en paralelo (1 = sin paralelismo,
+      None = uno por núcleo).
+    - Carpeta_Progreso: si se indica, cada bloque terminado se guarda
+      en esta carpeta y, al volver a ejecutar con los mismos datos y
+      parámetros, los bloques ya guardados no se recalculan.
+
+    Retorna:
+    - DataFrame con 'Variable', 'Categoria', 'N', 'Media',
+      'Error_Estandar', 'IC_Inferior', 'IC_Superior',
+      'Valor_p_Permutacion' y 'Numero_Remuestras'.
+
+    """
+
+    import hashlib
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    Datos = Data_Frame[Data_Frame[Columna_Categoria].notna()]
+    if Categorias is None:
+        Categorias = sorted(Datos[Columna_Categoria].unique())
+
+    Cantidades_Bloque = [
+        min(Tamano_Bloque, Numero_Remuestras - Inicio)
+        for Inicio in range(0, Numero_Remuestras, Tamano_Bloque)
+    ]
+
+    Carpeta_Corrida = None
+    if Carpeta_Progreso is not None:
+        Hash = hashlib.sha256()
+        Hash.update(pd.util.hash_pandas_object(
+            Datos[[Columna_Categoria] + Columnas], index=False
+        ).to_numpy().tobytes())
+        Hash.update(json.dumps(
+            [Columnas, Columna_Categoria, list(Categorias),
+             Numero_Remuestras, Semilla, Tamano_Bloque],
+            default=str
+        ).encode('utf-8'))
+        Carpeta_Corrida = os.path.join(
+            Carpeta_Progreso, Hash.hexdigest()[:16]
+        )
+        os.makedirs(Carpeta_Corrida, exist_ok=True)
+
+    # Armar los grupos y las tareas pendientes.
+    Grupos = []
+    Resultados_Bloques = {}
+    Pendientes = []
+    for Numero_Grupo, Categoria in enumerate(Categorias):
+        Matriz = Datos.loc[
+            Datos[Columna_Categoria] == Categoria, Columnas
+        ].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        Presentes = (~np.isnan(Matriz)).astype(float)
+        Valores = np.nan_to_num(Matriz)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Observadas = Valores.sum(axis=0) / Presentes.sum(axis=0)
+        Grupos.append((Categoria, Presentes.sum(axis=0), Observadas))
+        if len(Matriz) == 0:
+            continue
+
+        for Numero_Bloque, Cantidad in enumerate(Cantidades_Bloque):
+            Clave = (Numero_Grupo, Numero_Bloque)
+            Ruta = (
+                os.path.join(
+                    Carpeta_Corrida,
+                    f"Bloque_{Numero_Grupo}_{Numero_Bloque}.npz"
+                ) if Carpeta_Corrida else None
+            )
+            if Ruta and os.path.exists(Ruta):
+                with np.load(Ruta) as Archivo:
+                    Resultados_Bloques[Clave] = {
+                        'Medias': Archivo['Medias'],
+                        'Excesos': Archivo['Excesos']
+                    }
+                continue
+            Pendientes.append((Clave, Ruta, {
+                'Valores': Valores,
+                'Presentes': Presentes,
+                'Observadas': Observadas,
+                'Cantidad': Cantidad,
+                'Semilla': (Semilla, Clave)
+            }))
+
+    def Registrar(Clave, Ruta, Resultado):
+        Resultados_Bloques[Clave] = Resultado
+        if Ruta:
+            # Escribir primero a un temporal para no dejar bloques a medias.
+            Ruta_Temporal = Ruta[:-4] + '_tmp.npz'
+            np.savez(Ruta_Temporal, **Resultado)
+            os.replace(Ruta_Temporal, Ruta)
+
+    if Numero_Procesos == 1:
+        for Clave, Ruta, Tarea in Pendientes:
+            Registrar(Clave, Ruta, Remuestrear_Bloque(Tarea))
+    elif Pendientes:
+        with ProcessPoolExecutor(max_workers=Numero_Procesos) as Ejecutor:
+            Futuros = {
+                Ejecutor.submit(Remuestrear_Bloque, Tarea): (Clave, Ruta)
+                for Clave, Ruta, Tarea in Pendientes
+            }
+            # Cada bloque se guarda apenas termina, sin esperar a los
+            # anteriores: si la corrida se interrumpe, no se pierde.
+            for Futuro in as_completed(Futuros):
+                Clave, Ruta = Futuros[Futuro]
+                Registrar(Clave, Ruta, Futuro.result())
+
+    # Reunir los bloques de cada grupo.
+    Alfa = (1 - Nivel_Confianza) / 2
+    Tablas = []
+    for Numero_Grupo, (Categoria, N, Observadas) in enumerate(Grupos):
+        Bloques = [
+            Resultados_Bloques[(Numero_Grupo, Numero_Bloque)]
+            for Numero_Bloque in range(len(Cantidades_Bloque))
+            if (Numero_Grupo, Numero_Bloque) in Resultados_Bloques
+        ]
+        if Bloques:
+            Medias = np.vstack([Bloque['Medias'] for Bloque in Bloques])
+            Excesos = np.sum([Bloque['Excesos'] for Bloque in Bloques], axis=0)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                Inferior, Superior = np.nanpercentile(
+                    Medias, [100 * Alfa, 100 * (1 - Alfa)], axis=0
+                )
+                Error_Estandar = np.nanstd(Medias, axis=0, ddof=1)
+            Valores_P = (1 + Excesos) / (1 + Numero_Remuestras)
+        else:
+            Inferior = Superior = Error_Estandar = Valores_P = np.full(
+                len(Columnas), np.nan
+            )
+        Tablas.append(pd.DataFrame({
+            'Variable': Columnas,
+            'Categoria': Categoria,
+            'N': N.astype(int),
+            'Media': Observadas,
+            'Error_Estandar': Error_Estandar,
+            'IC_Inferior': Inferior,
+            'IC_Superior': Superior,
+            'Valor_p_Permutacion': np.where(N > 0, Valores_P, np.nan),
+            'Numero_Remuestras': Numero_Remuestras
+        }))
+
+    return pd.concat(Tablas, ignore_index=True)
+
+
+def Calcular_Rangos_Por_Pares(Matriz: np.ndarray, Columna: int) -> np.ndarray:
+
+    """
+    
+    Calcula los rangos promedio de una columna frente a cada una de las
+    columnas j, usando solo las filas donde la columna y j tienen dato.
+    Ordena la columna una sola vez y obtiene los rangos de todos sus
+    pares con sumas acumuladas de la máscara de presencia.
+
+    Parámetros:
+    - Matriz: arreglo filas x columnas con NaN en los faltantes.
+    - Columna: índice de la columna a rankear.
+
+    Retorna:
+    - Arreglo filas x columnas: [:, j] son los rangos de la columna
+      entre las filas completas del par (Columna, j) (0 en el resto).
+
+    """
+
+    Presentes = ~np.isnan(Matriz)
+    Rangos = np.zeros(Matriz.shape)
+
+    Validas = np.flatnonzero(Presentes[:, Columna])
+    if len(Validas) == 0:
+        return Rangos
+    Orden = Validas[np.argsort(Matriz[Validas, Columna], kind='stable')]
+    Valores = Matriz[Orden, Columna]
+
+    # Grupos de empates dentro del orden: posición de inicio y fin.
+    Inicio_Grupo = np.r_[True, Valores[1:] != Valores[:-1]]
+    Numero_Grupo = np.cumsum(Inicio_Grupo) - 1
+    Inicios = np.flatnonzero(Inicio_Grupo)
+    Fines = np.r_[Inicios[1:], len(Valores)] - 1
+
+    # Cantidad acumulada de filas presentes en cada otra columna.
+    Acumulado = np.cumsum(Presentes[Orden], axis=0, dtype=float)
+    Hasta_Fin = Acumulado[Fines[Numero_Grupo]]
+    Antes_Inicio = np.where(
+        (Inicios[Numero_Grupo] > 0)[:, None],
+        Acumulado[np.maximum(Inicios[Numero_Grupo] - 1, 0)],
+        0
+    )
+    Rangos_Columna = Antes_Inicio + (Hasta_Fin - Antes_Inicio + 1) / 2
+    Rangos_Columna[~Presentes[Orden]] = 0
+    Rangos[Orden] = Rangos_Columna
+
+    return Rangos
+
+def Calcular_Spearman_Matriz(Matriz: np.ndarray) -> tuple:
+
+    """
+    
+    Calcula ρ de Spearman y el tamaño de muestra de todos los pares de
+    columnas con eliminación por pares. Si no hay faltantes, rankea
+    cada columna una vez y resuelve todo con un producto de matrices;
+    si los hay, procesa una columna por vez frente a todas las demás,
+    con memoria proporcional a filas x columnas.
+
+    Parámetros:
+    - Matriz: arreglo filas x columnas con NaN en los faltantes.
+
+    Retorna:
+    - Tupla (Rho, N) de matrices columnas x columnas.
+
+    """
+
+    Filas, Columnas = Matriz.shape
+
+    if not np.isnan(Matriz).any():
+        Rangos = pd.DataFrame(Matriz).rank().to_numpy()
+        Centrados = Rangos - Rangos.mean(axis=0)
+        Covarianza = Centrados.T @ Centrados
+        Desvios = np.sqrt(np.diag(Covarianza))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Rho = Covarianza / np.outer(Desvios, Desvios)
+        return Rho, np.full((Columnas, Columnas), float(Filas))
+
+    Presentes = ~np.isnan(Matriz)
+    Mascara = Presentes.astype(float)
+    N = Mascara.T @ Mascara
+
+    Producto = np.empty((Columnas, Columnas))
+    Cuadrados = np.empty((Columnas, Columnas))
+    for Columna in range(Columnas):
+        # A[:, j]: rangos de la columna dentro del par (Columna, j).
+        # B[:, j]: rangos de j entre las filas con dato en la columna,
+        # que son las filas del par.
+        A = Calcular_Rangos_Por_Pares(Matriz, Columna)
+        B = np.zeros_like(A)
+        Filas_Columna = Presentes[:, Columna]
+        B[Filas_Columna] = np.nan_to_num(
+            pd.DataFrame(Matriz[Filas_Columna]).rank().to_numpy()
+        )
+        Producto[Columna] = np.einsum('kj,kj->j', A, B)
+        Cuadrados[Columna] = np.einsum('kj,kj->j', A, A)
+
+    # Dentro de cada par los rangos van de 1 a N, con media (N + 1) / 2.
+    Media = (N + 1) / 2
+    Producto -= N * Media ** 2
+    Cuadrados -= N * Media ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Rho = Producto / np.sqrt(Cuadrados * Cuadrados.T)
+
+    return Rho, N
+
+def Calcular_Correlaciones_Spearman_Matriz(
+    Data_Frame: pd.DataFrame,
+    Variables: List[str],
+    Eliminacion_Conjunta: bool = False,
+    Metodo_Ajuste: str = None,
+    Numero_Remuestras: int = 0,
+    Nivel_Confianza: float = 0.95,
+    Semilla: int = 0
+) -> Dict[str, pd.DataFrame]:
+
+    """
+    
+    Calcula la matriz completa de correlaciones de Spearman con sus
+    valores p en una sola pasada vectorizada. Da los mismos resultados
+    que scipy.stats.spearmanr par por par.
+
+    Parámetros:
+    - Data_Frame: DataFrame con los datos.
+    - Variables: columnas a correlacionar (las que no existen se omiten).
+    - Eliminacion_Conjunta: si es True, usa solo las filas completas en
+      todas las variables; si es False, cada par usa sus filas completas.
+    - Metodo_Ajuste: ajuste de los valores p sobre los pares distintos
+      (ej: 'fdr_bh'; ver Ajustar_Valores_P). None para no ajustar.
+    - Numero_Remuestras: si es mayor que 0, agrega intervalos bootstrap
+      percentil de ρ remuestreando filas.
+    - Nivel_Confianza: nivel de los intervalos bootstrap.
+    - Semilla: semilla del bootstrap.
+
+    Retorna:
+    - Diccionario de DataFrames variables x variables: 'Rho', 'Valor_p'
+      y 'N'; además 'Valor_p_Ajustado' si se pidió ajuste e
+      'IC_Inferior' / 'IC_Superior' si se pidió bootstrap.
+
+    """
+
+    from scipy import stats
+
+    Variables = [
+        Variable for Variable in Variables if Variable in Data_Frame.columns
+    ]
+    Datos = Data_Frame[Variables].apply(pd.to_numeric, errors='coerce')
+    if Eliminacion_Conjunta:
+        Datos = Datos.dropna()
+    Matriz = Datos.to_numpy(dtype=float)
+
+    Rho, N = Calcular_Spearman_Matriz(Matriz)
+    Grados_Libertad = N - 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        T = Rho * np.sqrt(Grados_Libertad / ((1 - Rho) * (1 + Rho)))
+    Valores_P = 2 * stats.t.sf(np.abs(T), Grados_Libertad)
+    np.fill_diagonal(Rho, 1.0)
+    np.fill_diagonal(Valores_P, 0.0)
+
+    def Como_Tabla(Valores):
+        return pd.DataFrame(Valores, index=Variables, columns=Variables)
+
+    Resultados = {
+        'Rho': Como_Tabla(Rho),
+        'Valor_p': Como_Tabla(Valores_P),
+        'N': Como_Tabla(N.astype(int))
+    }
+
+    if Metodo_Ajuste is not None:
+        Superior = np.triu_indices(len(Variables), 1)
+        Ajustados = np.zeros_like(Valores_P)
+        Ajustados[Superior] = Ajustar_Valores_P(
+            Valores_P[Superior], Metodo_Ajuste
+        )
+        Ajustados = Ajustados + Ajustados.T
+        Resultados['Valor_p_Ajustado'] = Como_Tabla(Ajustados)
+
+    if Numero_Remuestras > 0:
+        Generador = np.random.default_rng(Semilla)
+        Remuestras = np.empty((Numero_Remuestras,) + Rho.shape)
+        for Numero in range(Numero_Remuestras):
+            Indices = Generador.integers(0, len(Matriz), len(Matriz))
+            Remuestras[Numero] = Calcular_Spearman_Matriz(Matriz[Indices])[0]
+        Alfa = (1 - Nivel_Confianza) / 2
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            Inferior, Superior_IC = np.nanpercentile(
+                Remuestras, [100 * Alfa, 100 * (1 - Alfa)], axis=0
+            )
+        Resultados['IC_Inferior'] = Como_Tabla(Inferior)
+        Resultados['IC_Superior'] = Como_Tabla(Superior_IC)
+
+    return Resultados
+
+
+# Contexto de la ejecución actual; se crea una sola vez por proceso en
+# Obtener_Contexto_Ejecucion.
+Contexto_Ejecucion = None
+
+def Detectar_Etapa() -> str:
+
+    """
+    
+    Determina el nombre de la etapa (notebook o script) en ejecución,
+    sin recorrer directorios ni pedir datos al usuario. Usa, en orden:
+    la variable de entorno ETAPA_PIPELINE, la variable Etapa_Pipeline
+    del espacio de nombres de IPython (ej: papermill -p Etapa_Pipeline
+    ...), la ruta del notebook que exponen VS Code y Jupyter
+    (__vsc_ipynb_file__, __session__, JPY_SESSION_NAME) y, fuera de
+    IPython, el script de sys.argv[0].
+
+    Retorna:
+    - Nombre de la etapa sin extensión ('Sin_Nombre' si no se puede
+      determinar).
+
+    """
+
+    import sys
+
+    Etapa = os.environ.get('ETAPA_PIPELINE')
+
+    try:
+        from IPython import get_ipython
+        Shell = get_ipython()
+    except ImportError:
+        Shell = None
+
+    if not Etapa and Shell is not None:
+        for Variable in ['Etapa_Pipeline', '__vsc_ipynb_file__', '__session__']:
+            Valor = Shell.user_ns.get(Variable)
+            if isinstance(Valor, str) and Valor:
+                Etapa = Valor
+                break
+        else:
+            Etapa = os.environ.get('JPY_SESSION_NAME')
+
+    if not Etapa and Shell is None and sys.argv and sys.argv[0]:
+        Etapa = sys.argv[0]
+
+    if not Etapa:
+        return 'Sin_Nombre'
+
+    return os.path.splitext(os.path.basename(Etapa))[0]
+
+def Obtener_Contexto_Ejecucion(Etapa: str = None) -> Dict[str, Any]:
+
+    """
+    
+    Obtiene el contexto de la ejecución actual, que se crea la primera
+    vez que se llama en el proceso (en una cadena de %run, el del
+    primer notebook) y luego se reutiliza. Funciona en Jupyter,
+    papermill y python sin interacción del usuario.
+
+    Parámetros:
+    - Etapa: nombre de la etapa; solo se usa al crear el contexto (por
+      defecto, Detectar_Etapa()).
+
+    Retorna:
+    - Diccionario con:
+      - 'Etapa': nombre de la etapa.
+      - 'ID_Ejecucion': variable de entorno ID_EJECUCION o
+        fecha_hora_pid del inicio.
+      - 'Inicio': fecha y hora de creación del contexto.
+      - 'Carpeta_Salida': variable de entorno CARPETA_SALIDA o la
+        carpeta de los notebooks.
+      - 'Carpeta_Controles': carpeta Controles dentro de
+        Carpeta_Salida.
+      - 'Carpeta_Store': carpeta del almacén de bases.
+
+    """
+
+    global Contexto_Ejecucion
+
+    if Contexto_Ejecucion is not None:
+        return Contexto_Ejecucion
+
+    from datetime import datetime
+
+    Inicio = datetime.now()
+    Carpeta_Salida = os.path.abspath(os.environ.get(
+        'CARPETA_SALIDA', os.path.dirname(os.path.abspath(__file__))
+    ))
+    Carpeta_Controles = os.path.join(Carpeta_Salida, 'Controles')
+    os.makedirs(Carpeta_Controles, exist_ok=True)
+
+    Contexto_Ejecucion = {
+        'Etapa': Etapa or Detectar_Etapa(),
+        'ID_Ejecucion': os.environ.get(
+            'ID_EJECUCION', f"{Inicio:%Y%m%d_%H%M%S}_{os.getpid()}"
+        ),
+        'Inicio': Inicio,
+        'Carpeta_Salida': Carpeta_Salida,
+        'Carpeta_Controles': Carpeta_Controles,
+        'Carpeta_Store': os.path.abspath(Carpeta_Store)
+    }
+
+    return Contexto_Ejecucion
+
+def Obtener_Nombre_Archivo() -> str:
+
+   """
+   Obtiene el nombre del notebook o script actual desde el contexto
+   de ejecución (ver Obtener_Contexto_Ejecucion).
+   
+   Returns:
+       str: El nombre del notebook sin la extensión .ipynb
+   
+   """
+
+   return Obtener_Contexto_Ejecucion()['Etapa']
+
+def Definir_Etapa(
+    Nombre: str,
+    Funcion,
+    Dependencias: List[str] = None,
+    Parametros: Dict[str, Any] = None,
+    Archivos: List[str] = None
+) -> Dict[str, Any]:
+
+    """
+    
+    Define una etapa del pipeline para Ejecutar_Pipeline.
+
+    Parámetros:
+    - Nombre: nombre único de la etapa (ej: '18. Columnas de CO y CT').
+    - Funcion: función que recibe, en el orden de 'Dependencias', el
+      diccionario de DataFrames (como dfs_Finales) de cada etapa previa
+      y sus 'Parametros' como argumentos con nombre, y retorna un
+      diccionario {nombre: DataFrame}.
+    - Dependencias: nombres de las etapas cuyas salidas necesita.
+    - Parametros: argumentos con nombre para la función; forman parte
+      de la clave de caché.
+    - Archivos: archivos de entrada externos (ej: CSV crudos) o patrones
+      glob (ej: '../Data/Resultados/*.csv'); la ruta y el hash del
+      contenido de cada archivo forman parte de la clave de caché (ver
+      Calcular_Hash_Entrada).
+
+    Retorna:
+    - Diccionario con la definición de la etapa.
+
+    """
+
+    return {
+        'Nombre': Nombre,
+        'Funcion': Funcion,
+        'Dependencias': list(Dependencias or []),
+        'Parametros': dict(Parametros or {}),
+        'Archivos': list(Archivos or [])
+    }
+
+def Calcular_Hash_Entrada(Ruta: str) -> str:
+
+    """
+    
+    Calcula el hash de un archivo de entrada de una etapa. En los
+    notebooks solo cuenta el código de sus celdas de código, así que
+    guardarlos con otras salidas o metadatos no cambia el hash; en el
+    resto de los archivos, el contenido completo.
+
+    """
+
+    import hashlib
+
+    if not Ruta.endswith('.ipynb'):
+        return Calcular_Hash_Archivo(Ruta)
+
+    with open(Ruta, encoding='utf-8') as Archivo:
+        Celdas = json.load(Archivo)['cells']
+    Codigo = json.dumps([
+        ''.join(Celda['source']) for Celda in Celdas
+        if Celda['cell_type'] == 'code'
+    ], ensure_ascii=False)
+
+    return hashlib.sha256(Codigo.encode('utf-8')).hexdigest()
+
+def Calcular_Hash_Codigo(Funcion) -> str:
+
+    """
+    
+    Calcula un hash del código fuente de una función (o de su bytecode
+    si el código fuente no está disponible).
+
+    """
+
+    import hashlib
+    import inspect
+    import marshal
+
+    try:
+        Codigo = inspect.getsource(Funcion).encode('utf-8')
+    except (OSError, TypeError):
+        Codigo = marshal.dumps(Funcion.__code__)
+
+    return hashlib.sha256(Codigo).hexdigest()
+
+def Guardar_Tabla(
+    Dataframe: pd.DataFrame,
+    Ruta_Sin_Extension: str,
+    Formato: str = 'parquet'
+) -> str:
+
+    """
+    
+    Guarda un DataFrame en formato columnar ('parquet' o 'feather').
+    Si el DataFrame tiene columnas que ese formato no admite (ej: listas
+    de tipos mezclados) o no hay pyarrow, lo guarda en pickle.
+
+    Retorna:
+    - Ruta del archivo escrito.
+
+    """
+
+    import os
+
+    Ruta = f"{Ruta_Sin_Extension}.{Formato}"
+    try:
+        if Formato == 'feather':
+            Dataframe.reset_index(drop=True).to_feather(Ruta)
+        else:
+            Dataframe.to_parquet(Ruta)
+    except Exception:
+        if os.path.exists(Ruta):
+            os.remove(Ruta)
+        Ruta = f"{Ruta_Sin_Extension}.pkl"
+        Dataframe.to_pickle(Ruta)
+
+    return Ruta
+
+def Cargar_Tabla(
+    Ruta: str,
+    Columnas: List[str] = None,
+    Memoria_Mapeada: bool = True
+) -> pd.DataFrame:
+
+    """
+    
+    Carga un archivo escrito con Guardar_Tabla. En Parquet y Feather lee
+    solo las columnas pedidas y, si Memoria_Mapeada es True, mapea el
+    archivo en memoria en lugar de copiarlo entero.
+
+    """
+
+    if Ruta.endswith('.parquet'):
+        Dataframe = pd.read_parquet(
+            Ruta, columns=Columnas, memory_map=Memoria_Mapeada
+        )
+    elif Ruta.endswith('.feather'):
+        import pyarrow.feather as feather
+        Dataframe = feather.read_table(
+            Ruta, columns=Columnas, memory_map=Memoria_Mapeada
+        ).to_pandas()
+    else:
+        Dataframe = pd.read_pickle(Ruta)
+        return Dataframe if Columnas is None else Dataframe[Columnas]
+
+    # Parquet y Feather devuelven las columnas de listas (ej:
+    # Orden_IP_Items) como arrays de NumPy: se vuelven a pasar a listas.
+    for Columna in Dataframe.columns[Dataframe.dtypes == object]:
+        Valores = Dataframe[Columna].dropna()
+        if len(Valores) and isinstance(Valores.iloc[0], np.ndarray):
+            Dataframe[Columna] = [
+                Valor.tolist() if isinstance(Valor, np.ndarray) else Valor
+                for Valor in Dataframe[Columna]
+            ]
+
+    return Dataframe
+
+def Listar_Columnas_Tabla(Ruta: str) -> List[str]:
+
+    """
+    
+    Lista las columnas de un archivo escrito con Guardar_Tabla leyendo
+    solo su esquema (en Parquet y Feather no se cargan los datos).
+
+    """
+
+    if Ruta.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        Esquema = pq.read_schema(Ruta)
+        Indices = set()
+        if Esquema.pandas_metadata:
+            Indices = {
+                Indice for Indice in
+                Esquema.pandas_metadata.get('index_columns', [])
+                if isinstance(Indice, str)
+            }
+        return [Nombre for Nombre in Esquema.names if Nombre not in Indices]
+    if Ruta.endswith('.feather'):
+        import pyarrow as pa
+        with pa.memory_map(Ruta) as Archivo:
+            return list(pa.ipc.open_file(Archivo).schema.names)
+
+    return list(pd.read_pickle(Ruta).columns)
+
+def Guardar_Diccionario_Dataframes(
+    Diccionario_Dataframes: Dict[str, pd.DataFrame],
+    Carpeta: str
+) -> None:
+
+    """
+    
+    Guarda cada DataFrame del diccionario en Carpeta con Guardar_Tabla
+    y escribe un índice 'Contenido.json' con el archivo de cada uno.
+
+    """
+
+    import os
+
+    os.makedirs(Carpeta, exist_ok=True)
+    Contenido = {}
+
+    for Nombre_Df, Dataframe in Diccionario_Dataframes.items():
+        Ruta = Guardar_Tabla(Dataframe, os.path.join(Carpeta, Nombre_Df))
+        Contenido[Nombre_Df] = os.path.basename(Ruta)
+
+    # El índice se escribe al final: su existencia marca la caché completa.
+    with open(os.path.join(Carpeta, 'Contenido.json'), 'w',
+              encoding='utf-8') as Archivo:
+        json.dump(Contenido, Archivo, ensure_ascii=False, indent=1)
+
+def Cargar_Diccionario_Dataframes(Carpeta: str) -> Dict[str, pd.DataFrame]:
+
+    """
+    
+    Carga un diccionario de DataFrames guardado con
+    Guardar_Diccionario_Dataframes.
+
+    """
+
+    import os
+
+    with open(os.path.join(Carpeta, 'Contenido.json'),
+              encoding='utf-8') as Archivo:
+        Contenido = json.load(Archivo)
+
+    return {
+        Nombre_Df: Cargar_Tabla(os.path.join(Carpeta, Nombre_Archivo))
+        for Nombre_Df, Nombre_Archivo in Contenido.items()
+    }
+
+def Ejecutar_Pipeline(
+    Etapas: List[Dict[str, Any]],
+    Objetivo: str,
+    Carpeta_Cache: str = 'Cache',
+    Forzar: List[str] = None
+) -> Dict[str, pd.DataFrame]:
+
+    """
+    
+    Ejecuta las etapas necesarias para obtener la salida de 'Objetivo',
+    reemplazando la cadena de '%run' entre notebooks. Cada etapa se
+    guarda en disco con una clave que combina el código de su función,
+    sus parámetros, el contenido de sus archivos de entrada, el código
+    de Funciones.py y las claves de sus dependencias. Si la clave ya
+    está en caché, la salida se carga del disco sin ejecutar la etapa ni
+    sus dependencias.
+
+    Parámetros:
+    - Etapas: lista de etapas creadas con Definir_Etapa.
+    - Objetivo: nombre de la etapa cuya salida se quiere obtener.
+    - Carpeta_Cache: carpeta donde se guardan las salidas.
+    - Forzar: nombres de etapas a recalcular aunque estén en caché.
+
+    Retorna:
+    - Diccionario {nombre: DataFrame} producido por 'Objetivo'.
+
+    Ejemplo:
+        >>> Etapas = [
+        ...     f.Definir_Etapa('17. Outliers', Eliminar_Outliers),
+        ...     f.Definir_Etapa('18. CO y CT', Crear_CO_CT,
+        ...                     Dependencias=['17. Outliers'])
+        ... ]
+        >>> dfs_Finales = f.Ejecutar_Pipeline(Etapas, '18. CO y CT')
+
+    """
+
+    import os
+    import glob
+    import hashlib
+
+    Etapas_Por_Nombre = {Etapa['Nombre']: Etapa for Etapa in Etapas}
+    if Objetivo not in Etapas_Por_Nombre:
+        raise KeyError(f"La etapa '{Objetivo}' no está definida.")
+    Forzar = set(Forzar or [])
+
+    with open(__file__, 'rb') as Archivo:
+        Hash_Funciones = hashlib.sha256(Archivo.read()).hexdigest()
+
+    Claves: Dict[str, str] = {}
+    Salidas: Dict[str, Dict[str, pd.DataFrame]] = {}
+
+    def Calcular_Clave(Nombre, Visitadas = ()):
+        if Nombre in Claves:
+            return Claves[Nombre]
+        if Nombre in Visitadas:
+            raise ValueError(f"Dependencia circular en la etapa '{Nombre}'.")
+        Etapa = Etapas_Por_Nombre[Nombre]
+        Estado_Archivos = [
+            [Ruta, Calcular_Hash_Entrada(Ruta)]
+            for Patron in Etapa['Archivos']
+            for Ruta in sorted(glob.glob(Patron))
+        ]
+        Claves_Dependencias = [
+            Calcular_Clave(Dependencia, Visitadas + (Nombre,))
+            for Dependencia in Etapa['Dependencias']
+        ]
+        Hash = hashlib.sha256(json.dumps(
+            [Calcular_Hash_Codigo(Etapa['Funcion']), Hash_Funciones,
+             Etapa['Parametros'], Estado_Archivos, Claves_Dependencias],
+            sort_keys=True, default=str
+        ).encode('utf-8'))
+        Claves[Nombre] = Hash.hexdigest()[:16]
+        return Claves[Nombre]
+
+    def Obtener_Salida(Nombre):
+        if Nombre in Salidas:
+            return Salidas[Nombre]
+        Etapa = Etapas_Por_Nombre[Nombre]
+        Carpeta = os.path.join(
+            Carpeta_Cache, Nombre, Calcular_Clave(Nombre)
+        )
+
+        if (Nombre not in Forzar and
+                os.path.exists(os.path.join(Carpeta, 'Contenido.json'))):
+            Salidas[Nombre] = Cargar_Diccionario_Dataframes(Carpeta)
+            return Salidas[Nombre]
+
+        # Cada etapa recibe copias para no modificar las salidas previas.
+        Entradas = [
+            {Nombre_Df: Dataframe.copy() for Nombre_Df, Dataframe
+             in Obtener_Salida(Dependencia).items()}
+            for Dependencia in Etapa['Dependencias']
+        ]
+        print(f"Ejecutando etapa: {Nombre}")
+        Salida = Etapa['Funcion'](*Entradas, **Etapa['Parametros'])
+
+        Guardar_Diccionario_Dataframes(Salida, Carpeta)
+        Salidas[Nombre] = Salida
+        return Salida
+
+    return Obtener_Salida(Objetivo)
+
+# Carpeta con los CSV crudos de cada instancia (Data/Resultados).
+Carpeta_Datos_Crudos = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'Data', 'Resultados'
+)
+
+# Cadena principal de notebooks (1 a 19). Cada lista es una etapa que
+# recibe el dfs_Finales de la anterior. Los notebooks 1, 1.1 y 2 van
+# juntos porque se pasan listas de DataFrames y el JSON decodificado, y
+# el 7 y el 8 porque el 8 usa la fiabilidad calculada en el 7.
+# Los notebooks de análisis (21 a 43 y 51) no son etapas: además de
+# dfs_Finales se pasan por '%run' resultados que no son DataFrames (ej:
+# Todas_Variables_Significativas, que cada uno amplía, o funciones de
+# gráficos), así que siguen encadenados desde el 21, que parte de la
+# salida en caché de esta cadena.
+Cadena_Notebooks = [
+    ['1. Armar databases de datos crudos',
+     '1.1. Variables de orden de ítems sin asociar',
+     '2. Formatear databases'],
+    ['3. Indice de positividad'],
+    ['4. Categorias de candidatos'],
+    ['5. Relleno de medianas de IP no asociados'],
+    ['6. Relleno de medianas de IP asociados'],
+    ['7. Indice de progresismo', '8. Indice de conservadurismo'],
+    ['9. Promedios de tiempos de respuesta'],
+    ['10. Redes sociales'],
+    ['11. Medios'],
+    ['12. Agrupamientos de variables socioeconomicas'],
+    ['13. Crear dummies'],
+    ['14. Ordenamiento de columnas'],
+    ['15. Eliminación de primeros ítems'],
+    ['16. Eliminacion de outliers por categoría'],
+    ['17. Eliminacion de outliers por tiempos'],
+    ['18. Columnas de CO y CT'],
+    ['19. CO y CT']
+]
+
+def Ejecutar_Notebooks_Etapa(
+    *Entradas: Dict[str, pd.DataFrame],
+    Notebooks: List[str]
+) -> Dict[str, pd.DataFrame]:
+
+    """
+    
+    Ejecuta las celdas de código de uno o más notebooks de la carpeta de
+    Funciones.py en un mismo espacio de nombres y retorna el dfs_Finales
+    resultante. Las celdas con '%run' (el eslabón de la cadena) se
+    omiten: el dfs_Finales de la etapa previa llega como entrada. Como
+    el '%%capture' de esas celdas, la salida impresa se descarta.
+
+    Parámetros:
+    - Entradas: dfs_Finales de la etapa previa, si la hay.
+    - Notebooks: nombres de los notebooks sin extensión, en orden.
+
+    Retorna:
+    - Diccionario dfs_Finales al terminar el último notebook.
+
+    """
+
+    import contextlib
+    import io
+
+    Carpeta_Notebooks = os.path.dirname(os.path.abspath(__file__))
+    Espacio: Dict[str, Any] = {'__name__': '__main__'}
+    if Entradas:
+        Espacio['dfs_Finales'] = Entradas[0]
+
+    # Los notebooks usan rutas relativas a su carpeta (ej: Controles/).
+    Directorio_Previo = os.getcwd()
+    os.chdir(Carpeta_Notebooks)
+    try:
+        for Nombre in Notebooks:
+            Ruta = os.path.join(Carpeta_Notebooks, f"{Nombre}.ipynb")
+            with open(Ruta, encoding='utf-8') as Archivo:
+                Celdas = json.load(Archivo)['cells']
+            for Celda in Celdas:
+                Codigo = ''.join(Celda['source'])
+                if (Celda['cell_type'] != 'code' or
+                        re.search(r'^\s*%run\s', Codigo, re.M)):
+                    continue
+                with contextlib.redirect_stdout(io.StringIO()):
+                    exec(compile(Codigo, f"<{Nombre}>", 'exec'), Espacio)
+    finally:
+        os.chdir(Directorio_Previo)
+
+    return Espacio['dfs_Finales']
+
+def Definir_Etapas_Notebooks(
+    Cadena: List[List[str]] = None
+) -> List[Dict[str, Any]]:
+
+    """
+    
+    Define una etapa de Ejecutar_Pipeline por cada grupo de notebooks de
+    la cadena, llamada como su último notebook y dependiente de la
+    etapa anterior. El código de los notebooks forma parte de la clave
+    de caché y, en la primera etapa, también el contenido de los CSV de
+    Carpeta_Datos_Crudos.
+
+    Parámetros:
+    - Cadena: lista de grupos de notebooks (por defecto,
+      Cadena_Notebooks).
+
+    Retorna:
+    - Lista de etapas para Ejecutar_Pipeline.
+
+    Ejemplo:
+        >>> dfs_Finales = f.Ejecutar_Pipeline(
+        ...     f.Definir_Etapas_Notebooks(), '19. CO y CT')
+
+    """
+
+    Carpeta_Notebooks = os.path.dirname(os.path.abspath(__file__))
+    Etapas: List[Dict[str, Any]] = []
+
+    for Notebooks in Cadena or Cadena_Notebooks:
+        Archivos = [
+            os.path.join(Carpeta_Notebooks, f"{Nombre}.ipynb")
+            for Nombre in Notebooks
+        ]
+        if not Etapas:
+            Archivos.append(os.path.join(Carpeta_Datos_Crudos, '*.csv'))
+        Etapas.append(Definir_Etapa(
+            Notebooks[-1],
+            Ejecutar_Notebooks_Etapa,
+            Dependencias=[Etapas[-1]['Nombre']] if Etapas else [],
+            Parametros={'Notebooks': list(Notebooks)},
+            Archivos=Archivos
+        ))
+
+    return Etapas
+
+# Carpeta del almacén de bases en formato columnar (Data/Store).
+Carpeta_Store = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'Data', 'Store'
+)
+
+def Normalizar_Tipos_Base(Dataframe: pd.DataFrame) -> pd.DataFrame:
+
+    """
+    
+    Convierte a numéricas las columnas de texto cuyos valores no nulos
+    son todos números, para que las bases guardadas queden tipadas y no
+    haya que volver a aplicar pd.to_numeric al cargarlas.
+
+    """
+
+    Columnas_Convertidas = {}
+    for Columna in Dataframe.columns:
+        Serie = Dataframe[Columna]
+        if Serie.dtype != object and not pd.api.types.is_string_dtype(Serie):
+            continue
+        No_Nulos = Serie.notna()
+        if not No_Nulos.any():
+            continue
+        if Serie[No_Nulos].map(lambda Valor: isinstance(
+            Valor, (list, dict, tuple, set)
+        )).any():
+            continue
+        Numerica = pd.to_numeric(Serie, errors='coerce')
+        if Numerica[No_Nulos].notna().all():
+            Columnas_Convertidas[Columna] = Numerica
+
+    if not Columnas_Convertidas:
+        return Dataframe
+
+    Dataframe = Dataframe.copy()
+    for Columna, Numerica in Columnas_Convertidas.items():
+        Dataframe[Columna] = Numerica
+
+    return Dataframe
+
+# Orden fijo de las categorías ideológicas de 'Categoria_PASO_2023'.
+Orden_Categorias = [
+    'Left_Wing', 'Progressivism', 'Centre',
+    'Moderate_Right_A', 'Moderate_Right_B',
+    'Right_Wing_Libertarian'
+]
+
+# Tipo de dato compacto de cada familia de columnas: (patrón, tipo).
+# 'Int8' se usa solo si todos los valores son enteros (si hay medianas
+# imputadas como 3.5, la columna queda en float32). En 'category', las
+# categorías con orden fijo van primero (todas, aunque alguna no esté
+# presente, para que bases distintas compartan las mismas categorías) y
+# el resto de las etiquetas presentes se agregan al final en orden
+# alfabético.
+Esquema_Tipos = [
+    (r'IP_Item_\d+(_Izq|_Der)?_Respuesta(_Original)?', 'Int8'),
+    (r'ECE_Item_\d+', 'Int8'),
+    (r'.+_Tiempo', 'float32'),
+    (r'Categoria_PASO_2023', 'category'),
+    (r'Region|Genero|Estrato_Social|Nivel_Educativo|Inmueble_Residencia|'
+     r'Fuente_Ingreso|Votara_2023|Voto_2019|Voto_PASO_2023|'
+     r'Candidato_PASO_2023|Afiliacion_Politica|Edad_Agrupada|'
+     r'Autopercepcion_\w+_Agrupada', 'category')
+]
+Orden_Categorias_Esquema = {'Categoria_PASO_2023': Orden_Categorias}
+
+def Aplicar_Esquema_Tipos(
+    Dataframe: pd.DataFrame,
+    Esquema: List[tuple] = None
+) -> pd.DataFrame:
+
+    """
+    
+    Convierte cada columna al tipo compacto de su familia según
+    Esquema_Tipos: respuestas Likert a Int8 nullable, tiempos a float32
+    y etiquetas a Categorical. Las columnas que no encajan en ninguna
+    familia, o cuyos valores no pueden convertirse sin pérdida, quedan
+    como estaban.
+
+    Parámetros:
+    - Dataframe: DataFrame a convertir (no se modifica).
+    - Esquema: lista de (patrón, tipo) (por defecto, Esquema_Tipos).
+
+    Retorna:
+    - DataFrame con los tipos compactos.
+
+    """
+
+    Esquema = [
+        (re.compile(Patron), Tipo)
+        for Patron, Tipo in (Esquema if Esquema is not None else Esquema_Tipos)
+    ]
+
+    Columnas_Convertidas = {}
+    for Columna in Dataframe.columns:
+        Tipo = next((
+            Tipo for Patron, Tipo in Esquema
+            if Patron.fullmatch(str(Columna))
+        ), None)
+        if Tipo is None:
+            continue
+        Serie = Dataframe[Columna]
+
+        if Tipo == 'category':
+            if isinstance(Serie.dtype, pd.CategoricalDtype):
+                continue
+            No_Nulos = Serie.dropna()
+            if No_Nulos.map(lambda Valor: isinstance(
+                Valor, (list, dict, tuple, set)
+            )).any():
+                continue
+            Presentes = set(No_Nulos.unique())
+            Orden = list(Orden_Categorias_Esquema.get(Columna, []))
+            Categorias = Orden + sorted(Presentes - set(Orden), key=str)
+            Columnas_Convertidas[Columna] = pd.Categorical(
+                Serie, categories=Categorias
+            )
+            continue
+
+        if Serie.dtype == Tipo:
+            continue
+        Numerica = pd.to_numeric(Serie, errors='coerce')
+        if Numerica.notna().sum() != Serie.notna().sum():
+            continue
+        Valores = Numerica.dropna().to_numpy(dtype=float)
+
+        if Tipo == 'Int8' and (
+            not np.all(Valores == np.round(Valores)) or
+            (Valores.size and (Valores.min() < -128 or Valores.max() > 127))
+        ):
+            Tipo = 'float32'
+        Columnas_Convertidas[Columna] = Numerica.astype(Tipo)
+
+    if not Columnas_Convertidas:
+        return Dataframe
+
+    Dataframe = Dataframe.copy()
+    for Columna, Serie in Columnas_Convertidas.items():
+        Dataframe[Columna] = Serie
+
+    return Dataframe
+
+def Guardar_Base(
+    Dataframe: pd.DataFrame,
+    Nombre: str,
+    Carpeta: str = None,
+    Formato: str = 'parquet',
+    Ruta_Excel: str = None
+) -> str:
+
+    """
+    
+    Guarda una base o resultado intermedio en el almacén columnar
+    (Data/Store por defecto), con tipos normalizados y compactos (ver
+    Aplicar_Esquema_Tipos). Excel queda solo
+    como formato de exportación: si se indica Ruta_Excel, también se
+    exporta ahí.
+
+    Parámetros:
+    - Dataframe: DataFrame a guardar.
+    - Nombre: nombre de la base (ej: 'Generales', 'df_Elecciones').
+    - Carpeta: carpeta del almacén (por defecto, Carpeta_Store).
+    - Formato: 'parquet' (por defecto) o 'feather'.
+    - Ruta_Excel: ruta opcional para exportar también a Excel.
+
+    Retorna:
+    - Ruta del archivo guardado en el almacén.
+
+    """
+
+    Carpeta = Carpeta or Carpeta_Store
+    os.makedirs(Carpeta, exist_ok=True)
+
+    # La exportación a Excel va primero: el almacén debe quedar más
+    # nuevo que el Excel para que Cargar_Base no vuelva a importarlo.
+    if Ruta_Excel is not None:
+        Dataframe.to_excel(Ruta_Excel, index=False)
+
+    # Eliminar versiones previas de la base en otros formatos.
+    for Extension in ['parquet', 'feather', 'pkl']:
+        Ruta_Previa = os.path.join(Carpeta, f"{Nombre}.{Extension}")
+        if os.path.exists(Ruta_Previa):
+            os.remove(Ruta_Previa)
+
+    return Guardar_Tabla(
+        Aplicar_Esquema_Tipos(Normalizar_Tipos_Base(Dataframe)),
+        os.path.join(Carpeta, Nombre),
+        Formato
+    )
+
+def Cargar_Base(
+    Nombre: str,
+    Columnas: List[str] = None,
+    Prefijos: List[str] = None,
+    Carpeta: str = None,
+    Ruta_Excel: str = None,
+    Hoja_Excel: str = None,
+    Memoria_Mapeada: bool = True
+) -> pd.DataFrame:
+
+    """
+    
+    Carga una base del almacén columnar leyendo solo las columnas
+    pedidas. Si se indica Ruta_Excel y la base no está en el almacén o
+    el Excel es más nuevo, lee el Excel una única vez y lo guarda en el
+    almacén antes de cargarlo.
+
+    Parámetros:
+    - Nombre: nombre de la base (ej: 'Generales').
+    - Columnas: columnas a leer (por defecto, todas). Las que la base
+      no tiene se omiten.
+    - Prefijos: lee además las columnas que empiezan con alguno de
+      estos prefijos (ej: ['DifDif_']), en el orden de la base.
+    - Carpeta: carpeta del almacén (por defecto, Carpeta_Store).
+    - Ruta_Excel: Excel de origen (ej: '../Data/Bases definitivas/Generales.xlsx').
+    - Hoja_Excel: hoja del Excel a importar (por defecto, la primera).
+    - Memoria_Mapeada: mapear el archivo en memoria al leerlo.
+
+    Retorna:
+    - DataFrame con las columnas pedidas.
+
+    Ejemplo:
+        >>> df_Generales = f.Cargar_Base(
+        ...     'Generales', ['Indice_Progresismo', 'CO_Congruente'],
+        ...     Ruta_Excel='../Data/Bases definitivas/Generales.xlsx')
+
+    """
+
+    Carpeta = Carpeta or Carpeta_Store
+
+    Ruta = None
+    for Extension in ['parquet', 'feather', 'pkl']:
+        Ruta_Candidata = os.path.join(Carpeta, f"{Nombre}.{Extension}")
+        if os.path.exists(Ruta_Candidata):
+            Ruta = Ruta_Candidata
+            break
+
+    if Ruta_Excel is not None and os.path.exists(Ruta_Excel) and (
+        Ruta is None or
+        os.path.getmtime(Ruta_Excel) > os.path.getmtime(Ruta)
+    ):
+        Ruta = Guardar_Base(
+            pd.read_excel(Ruta_Excel, sheet_name=Hoja_Excel or 0),
+            Nombre, Carpeta
+        )
+
+    if Ruta is None:
+        raise FileNotFoundError(
+            f"La base '{Nombre}' no está en {Carpeta}."
+        )
+
+    if Columnas is not None or Prefijos is not None:
+        Disponibles = Listar_Columnas_Tabla(Ruta)
+        Seleccion = [
+            Columna for Columna in (Columnas or [])
+            if Columna in Disponibles
+        ]
+        Seleccion += [
+            Columna for Columna in Disponibles
+            if Columna not in Seleccion and
+            any(str(Columna).startswith(Prefijo) for Prefijo in Prefijos or [])
+        ]
+        Columnas = list(dict.fromkeys(Seleccion))
+
+    return Cargar_Tabla(Ruta, Columnas, Memoria_Mapeada)
+
+def Calcular_Hash_Archivo(Ruta: str, Tamano_Bloque: int = 1 << 20) -> str:
+
+    """
+    
+    Calcula el hash SHA-256 del contenido de un archivo leyéndolo por
+    bloques.
+
+    """
+
+    import hashlib
+
+    Hash = hashlib.sha256()
+    with open(Ruta, 'rb') as Archivo:
+        for Bloque in iter(lambda: Archivo.read(Tamano_Bloque), b''):
+            Hash.update(Bloque)
+
+    return Hash.hexdigest()
+
+def Ordenar_Archivos_Naturalmente(Archivos: List[str]) -> List[str]:
+
+    """
+    
+    Ordena nombres de archivo comparando sus números como números, de
+    modo que 'Generales 10.csv' quede después de 'Generales 9.csv'.
+
+    """
+
+    return sorted(Archivos, key=lambda Nombre: [
+        int(Parte) if Parte.isdigit() else Parte.lower()
+        for Parte in re.split(r'(\d+)', os.path.basename(Nombre))
+    ])
+
+def Proyectar_Campos_Results(
+    Datos_Sujeto: Dict[str, Any],
+    Campos: List[str]
+) -> Dict[str, Any]:
+
+    """
+    
+    Deja en un sujeto decodificado solo los campos pedidos de 'results'.
+    Cada elemento de la lista 'results' conserva su posición (queda como
+    diccionario vacío si no tiene ninguno de los campos), de modo que
+    las funciones de extracción que acceden por índice siguen
+    funcionando.
+
+    Parámetros:
+    - Datos_Sujeto: diccionario decodificado del JSON de 'results'.
+    - Campos: rutas con puntos dentro de cada elemento de 'results'
+      (ej: ['fase_3.IP', 'fase_3.IP_modificada']).
+
+    Retorna:
+    - Diccionario con 'subject' y la lista 'results' reducida.
+
+    """
+
+    Arbol: Dict[str, Any] = {}
+    for Campo in Campos:
+        Nodo = Arbol
+        Partes = Campo.split('.')
+        for Parte in Partes[:-1]:
+            Nodo = Nodo.setdefault(Parte, {})
+            if Nodo is True:
+                break
+        else:
+            Nodo[Partes[-1]] = True
+
+    def Podar(Valor, Nodo):
+        if Nodo is True:
+            return Valor
+        return {
+            Clave: Podar(Valor[Clave], Nodo[Clave])
+            for Clave in Valor
+            if Clave in Nodo and (
+                Nodo[Clave] is True or isinstance(Valor[Clave], dict)
+            )
+        }
+
+    Array_Results = Datos_Sujeto.get('results', [])
+    return {
+        'subject': Datos_Sujeto.get('subject'),
+        'results': [
+            Podar(Item, Arbol) if isinstance(Item, dict) else {}
+            for Item in Array_Results
+        ] if isinstance(Array_Results, list) else []
+    }
+
+def Leer_CSV_Crudo_Por_Bloques(
+    Ruta: str,
+    Columnas: List[str] = None,
+    Campos_Results: List[str] = None,
+    Filas_Por_Bloque: int = 5000
+):
+
+    """
+    
+    Lee un CSV crudo por bloques de aproximadamente Filas_Por_Bloque
+    filas, decodificando solo las columnas pedidas. Usa el lector en
+    streaming de pyarrow y, si no está instalado, pd.read_csv con
+    chunksize. Todas las columnas se leen como texto: un bloque solo no
+    alcanza para decidir el tipo de una columna, así que los tipos se
+    infieren una única vez sobre la tabla completa (ver
+    Tipar_CSV_Crudo). Si se indican Campos_Results, el JSON de 'results'
+    se decodifica en cada bloque y se reemplaza por un diccionario con
+    solo esos campos (ver Proyectar_Campos_Results), así el texto
+    completo no se conserva en memoria.
+
+    Parámetros:
+    - Ruta: ruta del CSV.
+    - Columnas: columnas a leer (por defecto, todas).
+    - Campos_Results: campos de 'results' a conservar (ej: ['fase_3.IP']).
+      Si es None, 'results' se deja como texto.
+    - Filas_Por_Bloque: cantidad aproximada de filas por bloque.
+
+    Retorna:
+    - Generador de DataFrames de texto, uno por bloque.
+
+    """
+
+    if Campos_Results is not None and Columnas is not None and \
+            'results' not in Columnas:
+        Columnas = list(Columnas) + ['results']
+
+    def Proyectar_Bloque(df_Bloque):
+        if Campos_Results is not None and 'results' in df_Bloque.columns:
+            Datos_Proyectados = []
+            for Contenido_JSON in df_Bloque['results']:
+                try:
+                    Datos_Sujeto = Decodificar_JSON(Contenido_JSON)
+                except (ValueError, TypeError):
+                    Datos_Sujeto = None
+                Datos_Proyectados.append(
+                    Proyectar_Campos_Results(Datos_Sujeto, Campos_Results)
+                    if isinstance(Datos_Sujeto, dict) else None
+                )
+            df_Bloque['results'] = pd.Series(
+                Datos_Proyectados, index=df_Bloque.index, dtype=object
+            )
+        return df_Bloque
+
+    try:
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        pa_csv = None
+
+    if pa_csv is None:
+        for df_Bloque in pd.read_csv(
+            Ruta, usecols=Columnas, dtype=str, chunksize=Filas_Por_Bloque
+        ):
+            yield Proyectar_Bloque(df_Bloque)
+        return
+
+    import itertools
+    import pyarrow as pa
+
+    # pyarrow corta los bloques por bytes: se estima el tamaño de una
+    # fila con el primer MB del archivo.
+    with open(Ruta, 'rb') as Archivo:
+        Muestra = Archivo.read(1 << 20)
+    Bytes_Por_Fila = len(Muestra) / max(Muestra.count(b'\n'), 1)
+
+    # Todas las columnas se leen como texto, porque pyarrow fija los
+    # tipos con el primer bloque y fallaría si un bloque posterior no
+    # encaja.
+    Columnas_Archivo = list(pd.read_csv(Ruta, nrows=0).columns)
+    Columnas_Leidas = Columnas if Columnas is not None else Columnas_Archivo
+    # El lector de pyarrow parsea por adelantado unas decenas de lotes,
+    # así que los lotes se piden chicos (1/32 de bloque) y se juntan
+    # hasta completar Filas_Por_Bloque filas.
+    Lector = pa_csv.open_csv(
+        Ruta,
+        read_options=pa_csv.ReadOptions(
+            block_size=max(int(Bytes_Por_Fila * Filas_Por_Bloque / 32), 1 << 16),
+            use_threads=False
+        ),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=Columnas_Leidas,
+            column_types={Columna: pa.string() for Columna in Columnas_Leidas},
+            strings_can_be_null=True
+        )
+    )
+    Filas_Leidas = 0
+    Lotes = []
+    for Lote in itertools.chain(Lector, [None]):
+        if Lote is not None:
+            Lotes.append(Lote)
+            if sum(len(Lote) for Lote in Lotes) < Filas_Por_Bloque:
+                continue
+        if not Lotes:
+            break
+        df_Bloque = pa.Table.from_batches(Lotes).to_pandas()
+        Lotes = []
+        df_Bloque.index = pd.RangeIndex(
+            Filas_Leidas, Filas_Leidas + len(df_Bloque)
+        )
+        Filas_Leidas += len(df_Bloque)
+        yield Proyectar_Bloque(df_Bloque)
+
+def Tipar_CSV_Crudo(Dataframe: pd.DataFrame) -> pd.DataFrame:
+
+    """
+    
+    Infiere los tipos de un CSV crudo leído como texto, mirando cada
+    columna entera: pasa a numéricas las columnas cuyos valores son
+    todos números (ver Normalizar_Tipos_Base) y, como pd.read_csv, deja
+    en float las columnas vacías. 'results' queda como estaba.
+
+    """
+
+    Columnas_Tipables = [
+        Columna for Columna in Dataframe.columns if Columna != 'results'
+    ]
+    if not Columnas_Tipables:
+        return Dataframe
+
+    Dataframe = Dataframe.copy()
+    Dataframe[Columnas_Tipables] = Normalizar_Tipos_Base(
+        Dataframe[Columnas_Tipables]
+    )
+    for Columna in Columnas_Tipables:
+        if Dataframe[Columna].isna().all():
+            Dataframe[Columna] = np.nan
+
+    return Dataframe
+
+def Leer_CSV_Crudo(
+    Ruta: str,
+    Columnas: List[str] = None,
+    Campos_Results: List[str] = None,
+    Filas_Por_Bloque: int = 5000
+) -> pd.DataFrame:
+
+    """
+    
+    Lee un CSV crudo con Leer_CSV_Crudo_Por_Bloques, une los bloques con
+    una única concatenación y recién entonces infiere los tipos de cada
+    columna con Tipar_CSV_Crudo, para que todos los bloques queden con
+    el mismo tipo. La tabla completa se arma en memoria: la lectura por
+    bloques solo acota lo que se conserva de cada fila (Columnas y
+    Campos_Results).
+
+    Ejemplo:
+        >>> df_Orden = f.Leer_CSV_Crudo(
+        ...     '../Data/Resultados/Generales 1.csv', ['id', 'results'],
+        ...     Campos_Results=['fase_3.IP', 'fase_3.IP_modificada'])
+
+    """
+
+    Bloques = list(Leer_CSV_Crudo_Por_Bloques(
+        Ruta, Columnas, Campos_Results, Filas_Por_Bloque
+    ))
+    if not Bloques:
+        return pd.read_csv(Ruta, usecols=Columnas, nrows=0)
+
+    return Tipar_CSV_Crudo(pd.concat(Bloques, ignore_index=True))
+
+def Escribir_Particion_CSV_Crudo(
+    Ruta: str,
+    Ruta_Particion: str,
+    Filas_Por_Bloque: int = 5000
+) -> str:
+
+    """
+    
+    Convierte un CSV crudo en una partición Parquet sin armar la tabla
+    completa en memoria. Hace dos pasadas por bloques: la primera decide
+    el tipo de cada columna mirando el archivo entero (con el mismo
+    criterio que Tipar_CSV_Crudo: int64 si todos los valores son
+    enteros, float64 si son números o la columna está vacía y texto en
+    otro caso) y la segunda escribe cada bloque con ese tipo mediante
+    pyarrow.parquet.ParquetWriter.
+
+    Parámetros:
+    - Ruta: ruta del CSV.
+    - Ruta_Particion: ruta del archivo Parquet a escribir.
+    - Filas_Por_Bloque: cantidad aproximada de filas por bloque.
+
+    Retorna:
+    - Ruta de la partición escrita.
+
+    """
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    Columnas_Archivo = list(pd.read_csv(Ruta, nrows=0).columns)
+
+    # Primera pasada: qué columnas son numéricas y cuáles enteras.
+    Numericas = {Columna: Columna != 'results' for Columna in Columnas_Archivo}
+    Enteras = dict(Numericas)
+    for df_Bloque in Leer_CSV_Crudo_Por_Bloques(
+        Ruta, Filas_Por_Bloque=Filas_Por_Bloque
+    ):
+        for Columna in Columnas_Archivo:
+            if not Numericas[Columna]:
+                continue
+            Numerica = pd.to_numeric(df_Bloque[Columna], errors='coerce')
+            if Numerica.notna().sum() != df_Bloque[Columna].notna().sum():
+                Numericas[Columna] = Enteras[Columna] = False
+            elif Numerica.dtype.kind not in 'iu':
+                Enteras[Columna] = False
+
+    Esquema = pa.schema([
+        (Columna, pa.int64() if Enteras[Columna] else
+         pa.float64() if Numericas[Columna] else pa.string())
+        for Columna in Columnas_Archivo
+    ])
+
+    # Segunda pasada: cada bloque se escribe y se libera.
+    Ruta_Temporal = f"{Ruta_Particion}.tmp"
+    try:
+        with pq.ParquetWriter(Ruta_Temporal, Esquema) as Escritor:
+            for df_Bloque in Leer_CSV_Crudo_Por_Bloques(
+                Ruta, Filas_Por_Bloque=Filas_Por_Bloque
+            ):
+                Escritor.write_table(pa.table({
+                    Columna: pa.array(
+                        pd.to_numeric(df_Bloque[Columna], errors='coerce')
+                        if Numericas[Columna] else
+                        df_Bloque[Columna].astype(object).where(
+                            df_Bloque[Columna].notna(), None
+                        ),
+                        type=Esquema.field(Columna).type,
+                        from_pandas=True
+                    )
+                    for Columna in Columnas_Archivo
+                }, schema=Esquema))
+        os.replace(Ruta_Temporal, Ruta_Particion)
+    finally:
+        if os.path.exists(Ruta_Temporal):
+            os.remove(Ruta_Temporal)
+
+    return Ruta_Particion
+
+def Ingerir_CSV_Incremental(
+    Carpeta: str,
+    Instancia: str,
+    Archivos: List[str] = None,
+    Columna_ID: str = 'id',
+    Carpeta_Almacen: str = None,
+    Columnas: List[str] = None
+) -> pd.DataFrame:
+
+    """
+    
+    Ingiere los CSV crudos de una instancia de forma incremental. Lleva
+    un manifiesto con la ruta, tamaño, fecha de modificación y hash de
+    cada archivo ya ingerido, y solo lee los CSV nuevos o modificados.
+    Cada CSV pasa por bloques a una partición Parquet del almacén (ver
+    Escribir_Particion_CSV_Crudo), sin cargarse entero en memoria, y la
+    base de la instancia se arma con una única concatenación al final.
+
+    Parámetros:
+    - Carpeta: carpeta con los CSV crudos.
+    - Instancia: nombre de la instancia (ej: 'Generales').
+    - Archivos: nombres de los CSV a ingerir. Por defecto, todos los
+      '<Instancia> *.csv' de la carpeta.
+    - Columna_ID: columna con el ID de cada sujeto (siempre se carga).
+    - Carpeta_Almacen: carpeta de las particiones y del manifiesto
+      (por defecto, Data/Store/Crudos/<Instancia>).
+    - Columnas: columnas a cargar de las particiones (por defecto,
+      todas). Las particiones siempre guardan el CSV completo.
+
+    Retorna:
+    - DataFrame con la base completa de la instancia.
+
+    Ejemplo:
+        >>> df_Generales = f.Ingerir_CSV_Incremental(
+        ...     '../Data/Resultados/', 'Generales')
+
+    """
+
+    import glob
+
+    Carpeta_Almacen = Carpeta_Almacen or os.path.join(
+        Carpeta_Store, 'Crudos', Instancia
+    )
+    os.makedirs(Carpeta_Almacen, exist_ok=True)
+    Ruta_Manifiesto = os.path.join(Carpeta_Almacen, 'Manifiesto.json')
+
+    if Archivos is None:
+        Archivos = [
+            os.path.basename(Ruta) for Ruta in
+            glob.glob(os.path.join(Carpeta, f"{glob.escape(Instancia)} *.csv"))
+        ]
+    Archivos = Ordenar_Archivos_Naturalmente(Archivos)
+    if Columnas is not None and Columna_ID not in Columnas:
+        Columnas = [Columna_ID] + list(Columnas)
+
+    Manifiesto: Dict[str, Dict[str, Any]] = {}
+    if os.path.exists(Ruta_Manifiesto):
+        with open(Ruta_Manifiesto, encoding='utf-8') as Archivo:
+            Manifiesto = json.load(Archivo)
+
+    # Quitar del manifiesto los archivos que ya no forman parte de la instancia.
+    for Nombre_Archivo in set(Manifiesto) - set(Archivos):
+        Ruta_Particion = os.path.join(
+            Carpeta_Almacen, Manifiesto.pop(Nombre_Archivo)['Particion']
+        )
+        if os.path.exists(Ruta_Particion):
+            os.remove(Ruta_Particion)
+
+    Archivos_Nuevos = []
+    for Nombre_Archivo in Archivos:
+        Ruta = os.path.join(Carpeta, Nombre_Archivo)
+        Tamano = os.path.getsize(Ruta)
+        Fecha_Modificacion = os.path.getmtime(Ruta)
+        Entrada = Manifiesto.get(Nombre_Archivo)
+
+        if Entrada is not None and os.path.exists(
+            os.path.join(Carpeta_Almacen, Entrada['Particion'])
+        ):
+            if (Entrada['Tamano'] == Tamano and
+                    Entrada['Fecha_Modificacion'] == Fecha_Modificacion):
+                continue
+            # Solo cambió la fecha: el contenido sigue siendo el mismo.
+            Hash = Calcular_Hash_Archivo(Ruta)
+            if Entrada['Hash'] == Hash:
+                Entrada['Fecha_Modificacion'] = Fecha_Modificacion
+                continue
+        else:
+            Hash = Calcular_Hash_Archivo(Ruta)
+
+        # El CSV pasa por bloques a su partición, sin cargarlo entero.
+        Ruta_Particion = Escribir_Particion_CSV_Crudo(Ruta, os.path.join(
+            Carpeta_Almacen, f"{os.path.splitext(Nombre_Archivo)[0]}.parquet"
+        ))
+        Manifiesto[Nombre_Archivo] = {
+            'Ruta': os.path.abspath(Ruta),
+            'Tamano': Tamano,
+            'Fecha_Modificacion': Fecha_Modificacion,
+            'Hash': Hash,
+            'Particion': os.path.basename(Ruta_Particion)
+        }
+        Archivos_Nuevos.append(Nombre_Archivo)
+
+    # El manifiesto se escribe después de las particiones que describe.
+    with open(Ruta_Manifiesto, 'w', encoding='utf-8') as Archivo:
+        json.dump(Manifiesto, Archivo, ensure_ascii=False, indent=1)
+
+    if Archivos_Nuevos:
+        print(f"📥 {Instancia}: {len(Archivos_Nuevos)} archivo(s) nuevo(s) "
+              f"o modificado(s): {', '.join(Archivos_Nuevos)}")
+
+    Particiones = [
+        Cargar_Tabla(os.path.join(
+            Carpeta_Almacen, Manifiesto[Nombre_Archivo]['Particion']
+        ), Columnas, Memoria_Mapeada=False)
+        for Nombre_Archivo in Archivos
+    ]
+    if not Particiones:
+        return pd.DataFrame()
+
+    return pd.concat(Particiones, ignore_index=True)
+
+
+def Ajustar_Modelo_SEM(
+    Data_Frame: pd.DataFrame,
+    Nombre_Modelo: str,
+    Especificacion: str
+) -> pd.DataFrame:
+
+    """
+    
+    Ajusta con semopy un modelo con estructura latente y devuelve sus
+    regresiones con el mismo formato que Ajustar_Modelos_Path_Lote.
+
+    Parámetros:
+    - Data_Frame: DataFrame con las variables observadas.
+    - Nombre_Modelo: nombre del modelo para la columna 'Outcome'.
+    - Especificacion: descripción del modelo en sintaxis de semopy
+      (ej: 'Cambio =~ CO_Congruente + CT_Congruente\\n'
+      'Cambio ~ Indice_Progresismo + Indice_Conservadurismo').
+
+    Retorna:
+    - DataFrame con una fila por regresión ('~') del modelo. R², F y los
+      coeficientes estandarizados quedan en NaN.
+
+    """
+
+    from semopy import Model, calc_stats
+
+    Modelo = Model(Especificacion)
+    Variables = [
+        Variable for Variable in Modelo.vars['observed']
+        if Variable in Data_Frame.columns
+    ]
+    Datos = Data_Frame[Variables].dropna()
+    Modelo.fit(Datos)
+
+    Parametros = Modelo.inspect()
+    Parametros = Parametros[Parametros['op'] == '~']
+    Estadisticas = calc_stats(Modelo)
+
+    return pd.DataFrame({
+        'Outcome': Nombre_Modelo,
+        'Variable_Dependiente': Parametros['lval'].to_numpy(),
+        'Predictor': Parametros['rval'].to_numpy(),
+        'β': pd.to_numeric(Parametros['Estimate']).to_numpy(),
+        'β_std': np.nan,
+        'SE': pd.to_numeric(Parametros['Std. Err'], errors='coerce').to_numpy(),
+        't': pd.to_numeric(Parametros['z-value'], errors='coerce').to_numpy(),
+        'p': pd.to_numeric(Parametros['p-value'], errors='coerce').to_numpy(),
+        'n': len(Datos),
+        'R²': np.nan,
+        'R²_ajustado': np.nan,
+        'AIC': Estadisticas['AIC'].iloc[0],
+        'BIC': Estadisticas['BIC'].iloc[0],
+        'F_stat': np.nan,
+        'F_pvalue': np.nan,
+        'Metodo': 'SEM'
+    })
+
+def Ajustar_Modelos_Path_Lote(
+    Data_Frame: pd.DataFrame,
+    Outcomes: List[str],
+    Predictores: List[str],
+    Minimo_Observaciones: int = 10,
+    Modelos_Latentes: Dict[str, str] = None
+) -> pd.DataFrame:
+
+    """
+    
+    Ajusta por MCO (con constante) un modelo de path por cada outcome,
+    todos con los mismos predictores y eliminación por lista en cada
+    modelo. Agrupa los outcomes que comparten las mismas filas válidas,
+    arma X'X una sola vez por grupo y resuelve todos sus outcomes juntos.
+    Da los mismos resultados que statsmodels OLS modelo por modelo.
+
+    Parámetros:
+    - Data_Frame: DataFrame con los datos.
+    - Outcomes: variables dependientes.
+    - Predictores: variables independientes comunes a todos los modelos.
+    - Minimo_Observaciones: modelos con menos filas válidas se omiten.
+    - Modelos_Latentes: diccionario opcional nombre -> especificación de
+      semopy para los modelos con variables latentes, que se ajustan con
+      Ajustar_Modelo_SEM.
+
+    Retorna:
+    - DataFrame ordenado con una fila por outcome y predictor:
+      'Outcome', 'Variable_Dependiente', 'Predictor', 'β', 'β_std',
+      'SE', 't', 'p', 'n', 'R²', 'R²_ajustado', 'AIC', 'BIC', 'F_stat',
+      'F_pvalue' y 'Metodo' ('OLS' o 'SEM'). Las métricas de ajuste se
+      repiten en las filas de cada modelo.
+
+    """
+
+    from scipy import stats
+
+    Faltantes = [
+        Variable for Variable in Predictores
+        if Variable not in Data_Frame.columns
+    ]
+    if Faltantes:
+        raise KeyError(f"Predictores faltantes: {Faltantes}")
+
+    Outcomes_Existentes = []
+    for Outcome in Outcomes:
+        if Outcome in Data_Frame.columns:
+            Outcomes_Existentes.append(Outcome)
+        else:
+            print(f"  ⚠️  Variable faltante: {Outcome}")
+
+    X = Data_Frame[Predictores].apply(
+        pd.to_numeric, errors='coerce'
+    ).to_numpy(dtype=float)
+    Y = Data_Frame[Outcomes_Existentes].apply(
+        pd.to_numeric, errors='coerce'
+    ).to_numpy(dtype=float)
+    X = np.column_stack([np.ones(len(X)), X])
+    Cantidad_Parametros = X.shape[1]
+
+    # Filas válidas de cada modelo (columnas) y grupos de outcomes con el
+    # mismo patrón de faltantes.
+    Validas = ~np.isnan(X).any(axis=1)[:, None] & ~np.isnan(Y)
+    Patrones, Grupo_Outcome = np.unique(
+        Validas.T, axis=0, return_inverse=True
+    )
+    Grupo_Outcome = Grupo_Outcome.ravel()
+
+    Tablas = []
+    for Numero_Patron, Filas in enumerate(Patrones):
+        Columnas = np.flatnonzero(Grupo_Outcome == Numero_Patron)
+        n = int(Filas.sum())
+        if n < Minimo_Observaciones:
+            for Columna in Columnas:
+                print(
+                    f"  ⚠️  Datos insuficientes en "
+                    f"{Outcomes_Existentes[Columna]}: n={n}"
+                )
+            continue
+
+        X_Grupo = X[Filas]
+        Y_Grupo = Y[np.ix_(Filas, Columnas)]
+        Grados_Residuales = n - Cantidad_Parametros
+
+        # Un único X'X y una resolución con varios lados derechos.
+        XtX_Inversa = np.linalg.pinv(X_Grupo.T @ X_Grupo)
+        Coeficientes = XtX_Inversa @ (X_Grupo.T @ Y_Grupo)
+        Residuos = Y_Grupo - X_Grupo @ Coeficientes
+        Suma_Residuos = (Residuos ** 2).sum(axis=0)
+        Suma_Total = ((Y_Grupo - Y_Grupo.mean(axis=0)) ** 2).sum(axis=0)
+
+        Varianza = Suma_Residuos / Grados_Residuales
+        Errores = np.sqrt(np.outer(np.diag(XtX_Inversa), Varianza))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Valores_T = Coeficientes / Errores
+            R2 = 1 - Suma_Residuos / Suma_Total
+            R2_Ajustado = 1 - (n - 1) / Grados_Residuales * (1 - R2)
+            F = (
+                (Suma_Total - Suma_Residuos) / (Cantidad_Parametros - 1)
+            ) / Varianza
+            Log_Verosimilitud = -n / 2 * (
+                np.log(2 * np.pi) + np.log(Suma_Residuos / n) + 1
+            )
+            Coeficientes_Std = (
+                Coeficientes[1:] * X_Grupo[:, 1:].std(axis=0)[:, None] /
+                Y_Grupo.std(axis=0)
+            )
+        Valores_P = 2 * stats.t.sf(np.abs(Valores_T), Grados_Residuales)
+        F_P = stats.f.sf(F, Cantidad_Parametros - 1, Grados_Residuales)
+        AIC = -2 * Log_Verosimilitud + 2 * Cantidad_Parametros
+        BIC = -2 * Log_Verosimilitud + np.log(n) * Cantidad_Parametros
+
+        Cantidad_Predictores = len(Predictores)
+        Nombres = np.asarray(Outcomes_Existentes, dtype=object)[Columnas]
+        Tablas.append(pd.DataFrame({
+            'Outcome': np.repeat(Nombres, Cantidad_Predictores),
+            'Variable_Dependiente': np.repeat(Nombres, Cantidad_Predictores),
+            'Predictor': np.tile(Predictores, len(Columnas)),
+            'β': Coeficientes[1:].T.ravel(),
+            'β_std': Coeficientes_Std.T.ravel(),
+            'SE': Errores[1:].T.ravel(),
+            't': Valores_T[1:].T.ravel(),
+            'p': Valores_P[1:].T.ravel(),
+            'n': n,
+            'R²': np.repeat(R2, Cantidad_Predictores),
+            'R²_ajustado': np.repeat(R2_Ajustado, Cantidad_Predictores),
+            'AIC': np.repeat(AIC, Cantidad_Predictores),
+            'BIC': np.repeat(BIC, Cantidad_Predictores),
+            'F_stat': np.repeat(F, Cantidad_Predictores),
+            'F_pvalue': np.repeat(F_P, Cantidad_Predictores),
+            'Metodo': 'OLS'
+        }))
+
+    for Nombre_Modelo, Especificacion in (Modelos_Latentes or {}).items():
+        try:
+            Tablas.append(
+                Ajustar_Modelo_SEM(Data_Frame, Nombre_Modelo, Especificacion)
+            )
+        except Exception as Error:
+            print(f"  ❌ Error en semopy para {Nombre_Modelo}: {Error}")
+
+    Columnas_Resultado = [
+        'Outcome', 'Variable_Dependiente', 'Predictor', 'β', 'β_std', 'SE',
+        't', 'p', 'n', 'R²', 'R²_ajustado', 'AIC', 'BIC', 'F_stat',
+        'F_pvalue', 'Metodo'
+    ]
+    if not Tablas:
+        return pd.DataFrame(columns=Columnas_Resultado)
+
+    # Devolver los modelos en el orden pedido.
+    Orden = {
+        Nombre: Posicion for Posicion, Nombre in enumerate(
+            Outcomes_Existentes + list((Modelos_Latentes or {}).keys())
+        )
+    }
+    Resultados = pd.concat(Tablas, ignore_index=True)[Columnas_Resultado]
+    return Resultados.sort_values(
+        by='Outcome', key=lambda Serie: Serie.map(Orden), kind='stable'
+    ).reset_index(drop=True)
+
+def Separar_Resultados_Path(
+    Resultados: pd.DataFrame
+) -> tuple:
+
+    """
+    
+    Separa la tabla de Ajustar_Modelos_Path_Lote en una tabla de
+    métricas de ajuste (una fila por modelo) y una de coeficientes con
+    la columna de significancia.
+
+    Parámetros:
+    - Resultados: DataFrame devuelto por Ajustar_Modelos_Path_Lote.
+
+    Retorna:
+    - Tupla (Metricas, Coeficientes) de DataFrames.
+
+    """
+
+    Metricas = Resultados.drop_duplicates('Outcome')[[
+        'Outcome', 'n', 'R²', 'R²_ajustado', 'AIC', 'BIC',
+        'F_stat', 'F_pvalue'
+    ]].reset_index(drop=True)
+
+    Coeficientes = Resultados[[
+        'Outcome', 'Predictor', 'β', 'β_std', 'SE', 't', 'p'
+    ]].rename(columns={'p': 'p-valor'}).reset_index(drop=True)
+    Coeficientes['Sig'] = np.select(
+        [
+            Coeficientes['p-valor'] < 0.001,
+            Coeficientes['p-valor'] < 0.01,
+            Coeficientes['p-valor'] < 0.05
+        ],
+        ['***', '**', '*'],
+        default='ns'
+    )
+
+    return Metricas, Coeficientes
+
+# Colores de fondo y de texto de cada nivel de significancia en los
+# reportes de Excel ('—' = sin p-valor).
+Colores_Significancia = {
+    '***': ('90EE90', '006400'),
+    '**': ('B8F4B8', '228B22'),
+    '*': ('D4F4D4', '000000'),
+    'ns': ('FFE4E1', '8B0000'),
+    '—': ('FFFFFF', '000000')
+}
+
+# Colores de relleno de los estilos fijos de los reportes de Excel.
+Colores_Reporte_Excel = {
+    'Titulo': '2C5282',
+    'Encabezado': '2C5282',
+    'Encabezado_Oscuro': '1F4788',
+    'Subencabezado': '5B9BD5',
+    'Etiqueta': 'E7E6E6'
+}
+
+# Tamaños de fuente por defecto de cada nivel del reporte.
+Tamanos_Fuente_Reporte = {
+    'Titulo': 14,
+    'Encabezado': 12,
+    'Subencabezado': 10,
+    'Dato': 11
+}
+
+def Clasificar_Significancia(Valores_P) -> np.ndarray:
+
+    """
+    
+    Convierte p-valores en etiquetas de significancia ('***' < 0.001,
+    '**' < 0.01, '*' < 0.05, 'ns' en otro caso y '—' si falta).
+
+    Parámetros:
+    - Valores_P: arreglo o Serie de p-valores (NaN si no hay test).
+
+    Retorna:
+    - Arreglo de etiquetas con la misma longitud.
+
+    """
+
+    Valores_P = np.asarray(Valores_P, dtype=float)
+    return np.select(
+        [
+            np.isnan(Valores_P),
+            Valores_P < 0.001,
+            Valores_P < 0.01,
+            Valores_P < 0.05
+        ],
+        ['—', '***', '**', '*'],
+        default='ns'
+    )
+
+def Construir_Tabla_Resultados_Excel(
+    Diccionario_Resultados: Dict[str, Dict[str, Dict[str, dict]]],
+    Diccionario_P_Valores: Dict[str, Dict[str, float]]
+) -> pd.DataFrame:
+
+    """
+    
+    Aplana los diccionarios de estadísticas y p-valores de los
+    notebooks de tablas en una tabla ordenada con una fila por
+    dataset, categoría y variable, con los textos ya formateados.
+
+    Parámetros:
+    - Diccionario_Resultados: {Dataset: {Categoria: {Variable:
+      {'Media', 'Desvio_Estandar', 'N', ...}}}}.
+    - Diccionario_P_Valores: {Dataset: {Variable: p-valor}}.
+
+    Retorna:
+    - DataFrame con las columnas 'Dataset', 'Categoria', 'Variable',
+      'Media', 'Desvio_Estandar', 'N', 'P_Valor', 'Media_DE' (texto
+      'M±DE'), 'n' (texto) y 'Sig'. Si falta la media, los tres textos
+      son '—'.
+
+    """
+
+    Registros = [
+        (
+            Dataset, Categoria, Variable,
+            Estadisticas.get('Media', np.nan),
+            Estadisticas.get('Desvio_Estandar', np.nan),
+            Estadisticas.get('N', 0),
+            Diccionario_P_Valores.get(Dataset, {}).get(Variable)
+        )
+        for Dataset, Categorias in Diccionario_Resultados.items()
+        for Categoria, Variables in Categorias.items()
+        for Variable, Estadisticas in Variables.items()
+        if Estadisticas
+    ]
+    Tabla = pd.DataFrame(Registros, columns=[
+        'Dataset', 'Categoria', 'Variable', 'Media', 'Desvio_Estandar',
+        'N', 'P_Valor'
+    ])
+    Tabla['P_Valor'] = pd.to_numeric(Tabla['P_Valor'], errors='coerce')
+
+    Con_Media = Tabla['Media'].notna().to_numpy()
+    Tabla['Media_DE'] = [
+        f'{Media:.2f}±{Desvio:.2f}' if Valida else '—'
+        for Media, Desvio, Valida in zip(
+            Tabla['Media'], Tabla['Desvio_Estandar'], Con_Media
+        )
+    ]
+    Tabla['n'] = [
+        str(int(N)) if Valida else '—'
+        for N, Valida in zip(Tabla['N'], Con_Media)
+    ]
+    Tabla['Sig'] = np.where(
+        Con_Media, Clasificar_Significancia(Tabla['P_Valor']), '—'
+    )
+
+    return Tabla
+
+def Registrar_Estilos_Reporte_Excel(
+    Libro,
+    Mapa_Colores_Categorias: Dict[str, str],
+    Tamanos: Dict[str, int] = None
+) -> None:
+
+    """
+    
+    Registra en un libro de openpyxl los estilos con nombre de los
+    reportes: 'Titulo', 'Encabezado', 'Encabezado_Oscuro',
+    'Subencabezado', 'Etiqueta', 'Dato', un 'Sig_<nivel>' por nivel de
+    significancia y un 'Categoria_<categoría>' por color de categoría.
+    Todos llevan borde fino y texto centrado, de modo que cada celda
+    solo referencia un estilo en lugar de crear sus propios objetos.
+
+    Parámetros:
+    - Libro: Workbook de openpyxl (normal o de solo escritura).
+    - Mapa_Colores_Categorias: {Categoria: '#RRGGBB'}.
+    - Tamanos: tamaños de fuente que reemplazan a los de
+      Tamanos_Fuente_Reporte (claves 'Titulo', 'Encabezado',
+      'Subencabezado', 'Dato').
+
+    """
+
+    from openpyxl.styles import (
+        Alignment, Border, Font, NamedStyle, PatternFill, Side
+    )
+
+    Tamanos = {**Tamanos_Fuente_Reporte, **(Tamanos or {})}
+    Lado = Side(style='thin', color='000000')
+    Borde = Border(left=Lado, right=Lado, top=Lado, bottom=Lado)
+    Alineacion = Alignment(horizontal='center', vertical='center')
+
+    def Relleno(Color):
+        return PatternFill(start_color=Color, end_color=Color, fill_type='solid')
+
+    # (nombre, fuente, color de relleno o None).
+    Definiciones = [
+        ('Titulo', Font(bold=True, color='FFFFFF', size=Tamanos['Titulo']),
+         Colores_Reporte_Excel['Titulo']),
+        ('Encabezado', Font(bold=True, color='FFFFFF', size=Tamanos['Encabezado']),
+         Colores_Reporte_Excel['Encabezado']),
+        ('Encabezado_Oscuro', Font(bold=True, color='FFFFFF', size=Tamanos['Encabezado']),
+         Colores_Reporte_Excel['Encabezado_Oscuro']),
+        ('Subencabezado', Font(bold=True, color='FFFFFF', size=Tamanos['Subencabezado']),
+         Colores_Reporte_Excel['Subencabezado']),
+        ('Etiqueta', Font(bold=True, size=Tamanos['Dato']),
+         Colores_Reporte_Excel['Etiqueta']),
+        ('Dato', Font(size=Tamanos['Dato']), None)
+    ]
+    Definiciones += [
+        (f'Sig_{Nivel}', Font(bold=True, color=Color_Texto, size=Tamanos['Dato']), Color_Fondo)
+        for Nivel, (Color_Fondo, Color_Texto) in Colores_Significancia.items()
+    ]
+    Definiciones += [
+        (f'Categoria_{Categoria}',
+         Font(bold=True, color='FFFFFF', size=Tamanos['Encabezado']),
+         Color.lstrip('#').upper())
+        for Categoria, Color in Mapa_Colores_Categorias.items()
+    ]
+
+    for Nombre, Fuente, Color in Definiciones:
+        Estilo = NamedStyle(
+            name=Nombre, font=Fuente, border=Borde, alignment=Alineacion
+        )
+        if Color is not None:
+            Estilo.fill = Relleno(Color)
+        Libro.add_named_style(Estilo)
+
+def Escribir_Tabla_Excel_Bloques(
+    Ruta_Archivo: str,
+    Nombre_Hoja: str,
+    Tabla: pd.DataFrame,
+    Filas,
+    Grupos: List[tuple],
+    Encabezados: List[List[tuple]],
+    Anchos_Columnas: List[float],
+    Mapa_Colores_Categorias: Dict[str, str],
+    Tamanos: Dict[str, int] = None,
+    Columnas_Significancia: tuple = ('Sig',)
+) -> str:
+
+    """
+    
+    Escribe en modo de solo escritura (streaming) una tabla de Excel con
+    una columna de etiquetas y bloques de columnas por grupo (por
+    ejemplo Media±DE, n y Sig por categoría o por dataset), a partir de
+    una tabla ordenada. Las filas se escriben a medida que se generan,
+    por lo que la memoria no crece con la cantidad de ítems.
+
+    Parámetros:
+    - Ruta_Archivo: ruta del .xlsx (la carpeta se crea si no existe).
+    - Nombre_Hoja: nombre de la hoja (se recorta a 31 caracteres).
+    - Tabla: DataFrame ordenado con las columnas 'Clave_Fila' y
+      'Clave_Grupo' más las columnas de valores de cada bloque.
+    - Filas: iterable de (Etiqueta, Estilo, Clave_Fila), o None para
+      una fila vacía con bordes.
+    - Grupos: lista de (Clave_Grupo, Columnas) con las columnas de Tabla
+      que forman cada bloque, en orden.
+    - Encabezados: filas de encabezado; cada una es una lista de
+      (Texto, Estilo, Columnas_Que_Ocupa) que cubre todo el ancho.
+    - Anchos_Columnas: ancho de cada columna, desde la de etiquetas.
+    - Mapa_Colores_Categorias: {Categoria: '#RRGGBB'} para los estilos
+      'Categoria_<categoría>'.
+    - Tamanos: tamaños de fuente (ver Registrar_Estilos_Reporte_Excel).
+    - Columnas_Significancia: columnas cuyo estilo depende del nivel de
+      significancia ('Sig_<nivel>'); el resto usa 'Dato'.
+
+    Retorna:
+    - Ruta del archivo guardado.
+
+    Las combinaciones de grupo y fila sin datos se escriben como '—'.
+
+    """
+
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+
+    Carpeta = os.path.dirname(Ruta_Archivo)
+    if Carpeta:
+        os.makedirs(Carpeta, exist_ok=True)
+
+    Libro = Workbook(write_only=True)
+    Hoja = Libro.create_sheet(Nombre_Hoja[:31])
+    Registrar_Estilos_Reporte_Excel(Libro, Mapa_Colores_Categorias, Tamanos)
+
+    # En modo de solo escritura los anchos deben fijarse antes de la
+    # primera fila.
+    for Posicion, Ancho in enumerate(Anchos_Columnas, start=1):
+        Hoja.column_dimensions[get_column_letter(Posicion)].width = Ancho
+
+    Columnas_Valores = list(dict.fromkeys(
+        Columna for _, Columnas in Grupos for Columna in Columnas
+    ))
+    Valores = dict(zip(
+        zip(Tabla['Clave_Fila'], Tabla['Clave_Grupo']),
+        Tabla[Columnas_Valores].itertuples(index=False, name=None)
+    ))
+    Posiciones = {Columna: i for i, Columna in enumerate(Columnas_Valores)}
+    Numero_Columnas = 1 + sum(len(Columnas) for _, Columnas in Grupos)
+    Estilos_Significancia = {f'Sig_{Nivel}' for Nivel in Colores_Significancia}
+
+    def Celda(Valor, Estilo):
+        Nueva = WriteOnlyCell(Hoja, Valor)
+        Nueva.style = Estilo
+        return Nueva
+
+    Fila_Actual = 0
+    for Encabezado in Encabezados:
+        Fila_Actual += 1
+        Celdas = []
+        for Texto, Estilo, Ancho in Encabezado:
+            Inicio = len(Celdas) + 1
+            Celdas.append(Celda(Texto, Estilo))
+            Celdas.extend(Celda(None, Estilo) for _ in range(Ancho - 1))
+            if Ancho > 1:
+                Hoja.merged_cells.add(
+                    f'{get_column_letter(Inicio)}{Fila_Actual}:'
+                    f'{get_column_letter(Inicio + Ancho - 1)}{Fila_Actual}'
+                )
+        Hoja.append(Celdas)
+
+    for Fila in Filas:
+        Fila_Actual += 1
+        if Fila is None:
+            Hoja.append([Celda(None, 'Dato') for _ in range(Numero_Columnas)])
+            continue
+
+        Etiqueta, Estilo_Etiqueta, Clave_Fila = Fila
+        Celdas = [Celda(Etiqueta, Estilo_Etiqueta)]
+        for Clave_Grupo, Columnas in Grupos:
+            Registro = Valores.get((Clave_Fila, Clave_Grupo))
+            for Columna in Columnas:
+                Valor = '—' if Registro is None else Registro[Posiciones[Columna]]
+                if Columna in Columnas_Significancia:
+                    Estilo = f'Sig_{Valor}'
+                    if Estilo not in Estilos_Significancia:
+                        Estilo = 'Sig_—'
+                else:
+                    Estilo = 'Dato'
+                Celdas.append(Celda(Valor, Estilo))
+        Hoja.append(Celdas)
+
+    Libro.save(Ruta_Archivo)
 
+    return Ruta_Archivo